@@ -0,0 +1,151 @@
+"""
+Insert, upsert and query throughput of the listing repository backends on
+synthetic listings.
+
+Usage:
+    python -m benchmarks.bench_repositories --rows 100000
+    python -m benchmarks.bench_repositories --rows 100000 --mongo-uri mongodb://localhost:27017
+"""
+
+import argparse
+import itertools
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from database.backends import InMemoryRepository, SQLiteRepository
+
+SOURCES = ["df-imoveis", "net-imoveis", "wimoveis", "zap-imoveis"]
+CONTRACT_TYPES = ["venda", "aluguel"]
+PROPERTY_TYPES = ["apartamento", "casa", "kitnet", "lote"]
+
+
+def make_documents(rows, seed=42):
+    """Generates synthetic listing documents with coordinates around Brasília."""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, len(SOURCES), rows)
+    contracts = rng.integers(0, len(CONTRACT_TYPES), rows)
+    types = rng.integers(0, len(PROPERTY_TYPES), rows)
+    prices = rng.uniform(800, 3_000_000, rows).round(2)
+    sizes = rng.uniform(20, 600, rows).round(1)
+    bedrooms = rng.integers(0, 6, rows)
+    latitudes = rng.uniform(-16.05, -15.5, rows)
+    longitudes = rng.uniform(-48.3, -47.4, rows)
+
+    return [
+        {
+            "page_link": f"https://www.{SOURCES[sources[i]]}.com.br/imovel/{i}",
+            "data_source": SOURCES[sources[i]],
+            "contract_type": CONTRACT_TYPES[contracts[i]],
+            "property_type": PROPERTY_TYPES[types[i]],
+            "price": float(prices[i]),
+            "size_m2": float(sizes[i]),
+            "bedrooms": int(bedrooms[i]),
+            "latitude": float(latitudes[i]),
+            "longitude": float(longitudes[i]),
+            "address": f"Quadra {i % 400} Conjunto {i % 20}, Brasília",
+        }
+        for i in range(rows)
+    ]
+
+
+def timed(func, *args, **kwargs):
+    """Runs a function and returns its result and elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(make_repository, documents, lookups=1000, chunk_size=1000):
+    """
+    Measures, on fresh repositories: a plain bulk insert, a first upsert (all
+    new), a re-upsert with 10% of the prices changed, key lookups and filtered
+    queries. Returns operations per second for each step.
+    """
+    rows = len(documents)
+    results = {}
+
+    repository = make_repository()
+    _, seconds = timed(
+        repository.insert_multiple_properties, [dict(d) for d in documents]
+    )
+    results["insert"] = rows / seconds
+
+    repository = make_repository()
+    _, seconds = timed(repository.upsert_properties, documents, chunk_size=chunk_size)
+    results["upsert (new)"] = rows / seconds
+
+    changed = [
+        dict(d, price=d["price"] * 1.05) if i % 10 == 0 else d
+        for i, d in enumerate(documents)
+    ]
+    counts, seconds = timed(
+        repository.upsert_properties, changed, chunk_size=chunk_size
+    )
+    results["upsert (10% changed)"] = rows / seconds
+    assert counts["updated"] == (rows + 9) // 10, counts
+
+    rng = np.random.default_rng(0)
+    keys = [documents[i]["page_link"] for i in rng.integers(0, rows, lookups)]
+    _, seconds = timed(lambda: [repository.find_by_listing_key(k) for k in keys])
+    results["find_by_listing_key"] = lookups / seconds
+
+    combinations = [
+        (s, c, p) for s in SOURCES for c in CONTRACT_TYPES for p in PROPERTY_TYPES
+    ]
+    found, seconds = timed(
+        lambda: sum(
+            len(list(repository.find_listings(s, c, p))) for s, c, p in combinations
+        )
+    )
+    results["find_listings (docs)"] = found / seconds
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--mongo-uri",
+        help="Also benchmark MongoDB (uses the housingprices_benchmark database)",
+    )
+    args = parser.parse_args()
+
+    documents = make_documents(args.rows)
+    tmpdir = tempfile.TemporaryDirectory()
+    sqlite_runs = itertools.count()
+
+    backends = {
+        "memory": InMemoryRepository,
+        "sqlite": lambda: SQLiteRepository(
+            os.path.join(tmpdir.name, f"listings-{next(sqlite_runs)}.db")
+        ),
+    }
+    if args.mongo_uri:
+        from database.connection import get_client
+        from database.indexes import ensure_indexes
+        from database.repository import Property
+
+        client = get_client(args.mongo_uri)
+
+        def make_mongo_repository():
+            client.drop_database("housingprices_benchmark")
+            repository = Property(client, database="housingprices_benchmark")
+            ensure_indexes(repository.property_listings)
+            return repository
+
+        backends["mongo"] = make_mongo_repository
+
+    print(f"{args.rows:,} listings, chunks of {args.chunk_size}")
+    for name, make_repository in backends.items():
+        results = run(make_repository, documents, chunk_size=args.chunk_size)
+        for step, rate in results.items():
+            print(f"{name:8} {step:24} {rate:>12,.0f} ops/sec")
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of DataHandler.save_to_csv against the previous multi-pass sanitizer.
+
+Usage:
+    python -m benchmarks.bench_save_to_csv --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.data_handler import DataHandler
+
+ADDRESSES = [
+    "SQN 308 Bloco A, Asa Norte",
+    "  Rua 12 Chácara 140\nVicente Pires ",
+    "QS 07 Rua 800,\tÁguas Claras",
+    "Quadra 104   Conjunto 5\r\nRecanto das Emas",
+]
+DESCRIPTIONS = [
+    "Apartamento com 3 quartos,\nsendo 1 suíte.\tVaranda gourmet e 2 vagas.",
+    "Casa   ampla em condomínio fechado\r\ncom piscina e churrasqueira.",
+    "Kitnet mobiliada próxima ao metrô. ",
+    "\tLote plano, escriturado, pronto para construir.",
+]
+
+
+def make_listings(rows, seed=42, string_dtype=object):
+    """Generates synthetic listings with dirty text fields and ~10% nulls."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "page_link": [
+                f"https://www.dfimoveis.com.br/imovel/{i}" for i in range(rows)
+            ],
+            "address": pd.Series(
+                np.array(ADDRESSES, dtype=object)[rng.integers(0, 4, rows)]
+            ),
+            "description": pd.Series(
+                np.array(DESCRIPTIONS, dtype=object)[rng.integers(0, 4, rows)]
+            ),
+            "price": rng.uniform(800, 3_000_000, rows).round(2),
+            "size_m2": rng.uniform(20, 600, rows).round(1),
+            "bedroom": rng.integers(0, 6, rows),
+            "contract_type": np.where(rng.random(rows) < 0.5, "venda", "aluguel"),
+        }
+    )
+    df.loc[rng.random(rows) < 0.1, "description"] = None
+    text_columns = ["page_link", "address", "description", "contract_type"]
+    return df.astype({col: string_dtype for col in text_columns})
+
+
+def legacy_save_to_csv(df, filepath, separator="\t"):
+    """The previous implementation: full copy plus five str.replace passes per column."""
+    df_to_save = df.copy()
+    warnings.filterwarnings("ignore", message=".*select_dtypes.*")
+    for col in df_to_save.select_dtypes(include="object").columns:
+        s_series = df_to_save[col].astype(str).fillna("")
+        s_series = s_series.str.replace("\r\n", " ", regex=False)
+        s_series = s_series.str.replace("\n", " ", regex=False)
+        s_series = s_series.str.replace("\r", " ", regex=False)
+        if separator == "\t":
+            s_series = s_series.str.replace("\t", " ", regex=False)
+        s_series = s_series.str.replace(r"\s+", " ", regex=True)
+        df_to_save[col] = s_series.str.strip()
+    df_to_save.to_csv(filepath, sep=separator, index=False)
+
+
+def current_save_to_csv(df, filepath, separator="\t"):
+    """The current DataHandler implementation."""
+    DataHandler([]).save_to_csv(df, filepath, separator=separator)
+
+
+def measure(func, df, filepath, track_memory):
+    """Returns (seconds, peak traced bytes or None) for a single run."""
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    func(df, filepath)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also report peak traced memory (slower, separate run)",
+    )
+    parser.add_argument(
+        "--string-dtype",
+        default="object",
+        help="dtype of the text columns, e.g. object (scraper output) or string[pyarrow]",
+    )
+    args = parser.parse_args()
+
+    df = make_listings(args.rows, string_dtype=args.string_dtype)
+    print(f"Generated {len(df)} synthetic listings")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, func in [
+            ("legacy", legacy_save_to_csv),
+            ("current", current_save_to_csv),
+        ]:
+            filepath = os.path.join(tmp_dir, f"{name}.tsv")
+            elapsed, _ = measure(func, df, filepath, track_memory=False)
+            line = f"{name:>8}: {elapsed:8.2f} s  ({len(df) / elapsed:,.0f} rows/s)"
+            if args.memory:
+                _, peak = measure(func, df, filepath, track_memory=True)
+                line += f"  peak {peak / 2**20:,.1f} MiB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
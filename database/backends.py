@@ -0,0 +1,232 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from database.repository import (
+    LISTING_KEY_FIELD,
+    ListingRepository,
+    _chunks,
+    listing_key,
+    upsert_documents,
+)
+
+# Fields stored in their own SQLite columns so filters can use an index
+_FILTER_FIELDS = ("data_source", "contract_type", "property_type")
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_IN_BATCH = 500
+
+
+def _matches(document, filters, since):
+    """Checks a stored listing against find_listings filters."""
+    for field, value in filters.items():
+        if value is not None and document.get(field) != value:
+            return False
+    return since is None or document["timestamp"] >= since
+
+
+class InMemoryRepository(ListingRepository):
+    """
+    Listing store backed by a dict keyed on listing key. Mirrors the MongoDB
+    repository's semantics for tests, benchmarks and offline runs.
+    """
+
+    def __init__(self):
+        self.listings = {}
+        self._lock = threading.Lock()
+
+    def insert_multiple_properties(self, properties_list):
+        now = datetime.now()
+        keys = []
+        with self._lock:
+            for property_data in properties_list:
+                key = listing_key(property_data)
+                self.listings[key] = dict(
+                    property_data, **{LISTING_KEY_FIELD: key, "timestamp": now}
+                )
+                keys.append(key)
+        return keys
+
+    def upsert_properties(self, properties, chunk_size=1000):
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        for chunk in _chunks(properties, chunk_size):
+            now = datetime.now()
+            with self._lock:
+                for key, document in upsert_documents(chunk).items():
+                    stored = self.listings.get(key)
+                    if stored is None:
+                        self.listings[key] = dict(
+                            document, **{LISTING_KEY_FIELD: key, "timestamp": now}
+                        )
+                        counts["inserted"] += 1
+                    elif all(stored.get(k) == v for k, v in document.items()):
+                        counts["unchanged"] += 1
+                    else:
+                        stored.update(document)
+                        counts["updated"] += 1
+        return counts
+
+    def find_by_listing_key(self, key):
+        return self.listings.get(key)
+
+    def find_listings(
+        self, data_source=None, contract_type=None, property_type=None, since=None
+    ):
+        filters = {
+            "data_source": data_source,
+            "contract_type": contract_type,
+            "property_type": property_type,
+        }
+        with self._lock:
+            found = [d for d in self.listings.values() if _matches(d, filters, since)]
+        return sorted(found, key=lambda d: d["timestamp"], reverse=True)
+
+
+class SQLiteRepository(ListingRepository):
+    """
+    Embedded listing store: one SQLite table keyed on listing key, with the
+    listing as a JSON document and the filter fields in indexed columns.
+    `path=":memory:"` keeps the database in memory.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS property_listings (
+                    listing_key TEXT PRIMARY KEY,
+                    data_source TEXT,
+                    contract_type TEXT,
+                    property_type TEXT,
+                    timestamp TEXT NOT NULL,
+                    document TEXT NOT NULL
+                )
+                """)
+            self.connection.execute("""
+                CREATE INDEX IF NOT EXISTS source_contract_property_timestamp
+                ON property_listings (data_source, contract_type, property_type, timestamp)
+                """)
+
+    @staticmethod
+    def _serialize(document):
+        """JSON of a document with sorted keys, so equal documents compare equal."""
+        return json.dumps(document, sort_keys=True, default=str, ensure_ascii=False)
+
+    @staticmethod
+    def _row(key, document, timestamp):
+        """Parameters of an INSERT for one listing."""
+        return (
+            key,
+            *(document.get(field) for field in _FILTER_FIELDS),
+            timestamp,
+            SQLiteRepository._serialize(document),
+        )
+
+    @staticmethod
+    def _to_document(key, timestamp, document):
+        """Rebuilds a listing from its row."""
+        listing = json.loads(document)
+        listing[LISTING_KEY_FIELD] = key
+        listing["timestamp"] = datetime.fromisoformat(timestamp)
+        return listing
+
+    def _stored_documents(self, keys):
+        """Serialized documents of the keys that already exist."""
+        stored = {}
+        for batch in _chunks(keys, _SQLITE_IN_BATCH):
+            placeholders = ",".join("?" * len(batch))
+            stored.update(
+                self.connection.execute(
+                    "SELECT listing_key, document FROM property_listings "
+                    f"WHERE listing_key IN ({placeholders})",
+                    batch,
+                )
+            )
+        return stored
+
+    def insert_multiple_properties(self, properties_list):
+        now = datetime.now().isoformat()
+        rows = [
+            self._row(listing_key(property_data), property_data, now)
+            for property_data in properties_list
+        ]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO property_listings VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return [row[0] for row in rows]
+
+    def upsert_properties(self, properties, chunk_size=1000):
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        for chunk in _chunks(properties, chunk_size):
+            now = datetime.now().isoformat()
+            documents = upsert_documents(chunk)
+            with self._lock, self.connection:
+                stored = self._stored_documents(list(documents))
+                inserts, updates = [], []
+                for key, document in documents.items():
+                    if key not in stored:
+                        inserts.append(self._row(key, document, now))
+                        continue
+                    merged = dict(json.loads(stored[key]), **document)
+                    serialized = self._serialize(merged)
+                    if serialized == stored[key]:
+                        counts["unchanged"] += 1
+                    else:
+                        updates.append(
+                            (
+                                *(merged.get(field) for field in _FILTER_FIELDS),
+                                serialized,
+                                key,
+                            )
+                        )
+
+                self.connection.executemany(
+                    "INSERT INTO property_listings VALUES (?, ?, ?, ?, ?, ?)", inserts
+                )
+                self.connection.executemany(
+                    "UPDATE property_listings SET data_source = ?, contract_type = ?, "
+                    "property_type = ?, document = ? WHERE listing_key = ?",
+                    updates,
+                )
+            counts["inserted"] += len(inserts)
+            counts["updated"] += len(updates)
+        return counts
+
+    def find_by_listing_key(self, key):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT listing_key, timestamp, document FROM property_listings "
+                "WHERE listing_key = ?",
+                (key,),
+            ).fetchone()
+        return None if row is None else self._to_document(*row)
+
+    def find_listings(
+        self, data_source=None, contract_type=None, property_type=None, since=None
+    ):
+        conditions, parameters = [], []
+        for field, value in zip(
+            _FILTER_FIELDS, (data_source, contract_type, property_type)
+        ):
+            if value is not None:
+                conditions.append(f"{field} = ?")
+                parameters.append(value)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(since.isoformat())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT listing_key, timestamp, document FROM property_listings "
+                f"{where} ORDER BY timestamp DESC",
+                parameters,
+            ).fetchall()
+        return [self._to_document(*row) for row in rows]
+
+    def close(self):
+        self.connection.close()
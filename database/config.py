@@ -1,6 +1,48 @@
 import os
 
-# Environment variables
-DB_USER = os.environ["MONGO_DB_USER"]
-DB_PASSWORD = os.environ["MONGO_DB_PASS"]
-DB_URI = os.environ["MONGO_URI"]
+# Environment variables, read on first access so importing this module does not
+# require MongoDB credentials (e.g. in the scrapers or offline pipeline steps)
+_ENV_VARIABLES = {
+    "DB_USER": "MONGO_DB_USER",
+    "DB_PASSWORD": "MONGO_DB_PASS",
+    "DB_URI": "MONGO_URI",
+}
+
+# Client options and the environment variables that override them. Options
+# defaulting to None are left to the connection string / driver default.
+CLIENT_DEFAULTS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 50),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", 60_000),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", 10_000),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", 60_000),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10_000),
+    "w": ("MONGO_WRITE_CONCERN", None),
+    "compressors": ("MONGO_COMPRESSORS", "zstd,snappy"),
+}
+
+
+def _parse_value(value, default):
+    """Casts an environment value to the type of its default."""
+    if isinstance(default, int) or value.isdigit():
+        # Numeric write concerns ("1") are ints, "majority" stays a string
+        return int(value)
+    return value
+
+
+def get_client_settings():
+    """Returns the MongoClient options, with environment overrides applied."""
+    settings = {}
+    for option, (variable, default) in CLIENT_DEFAULTS.items():
+        value = os.environ.get(variable)
+        if value is not None:
+            settings[option] = _parse_value(value, default)
+        elif default is not None:
+            settings[option] = default
+    return settings
+
+
+def __getattr__(name):
+    if name in _ENV_VARIABLES:
+        return os.environ[_ENV_VARIABLES[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
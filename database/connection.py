@@ -1,5 +1,81 @@
+import importlib.util
+import os
+import threading
+
 from pymongo import MongoClient
 
+from database import config
+
+# Python module each wire compressor needs; unavailable ones are left out
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+_clients = {}
+_clients_lock = threading.Lock()
+_clients_pid = os.getpid()
+
+
+def _available_compressors(compressors):
+    """Keeps the requested compressors whose Python module is installed."""
+    available = [
+        name.strip()
+        for name in compressors.split(",")
+        if name.strip() in _COMPRESSOR_MODULES
+        and importlib.util.find_spec(_COMPRESSOR_MODULES[name.strip()]) is not None
+    ]
+    return ",".join(available)
+
+
+def _forget_clients():
+    """
+    Drops the clients inherited from the parent process. Their sockets and
+    monitor threads belong to the parent, so a forked worker opens its own pool.
+    """
+    global _clients_lock, _clients_pid
+    _clients.clear()
+    _clients_lock = threading.Lock()
+    _clients_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_clients)
+
+
+def get_client(uri=None, **options):
+    """
+    Returns the process-wide MongoClient for the URI (MONGO_URI by default),
+    creating it on first use with the pool, timeout, write concern and
+    compression settings from the environment. `options` override them.
+    """
+    if _clients_pid != os.getpid():
+        # Forked without register_at_fork (or by a non-Python fork)
+        _forget_clients()
+
+    if uri is None:
+        uri = config.DB_URI
+
+    settings = config.get_client_settings()
+    settings.update(options)
+    if settings.get("compressors"):
+        settings["compressors"] = _available_compressors(settings["compressors"])
+    if not settings.get("compressors"):
+        settings.pop("compressors", None)
+
+    key = (uri, tuple(sorted(settings.items())))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = MongoClient(uri, **settings)
+            _clients[key] = client
+    return client
+
+
+def close_clients():
+    """Closes every client opened by this process."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
 
 class MongoDBConnection:
     def __init__(self, uri):
@@ -7,9 +83,10 @@ class MongoDBConnection:
         self.client = None
 
     def connect(self):
-        self.client = MongoClient(self.uri)
+        self.client = get_client(self.uri)
         return self.client
 
     def close(self):
-        if self.client:
-            self.client.close()
+        # The client is shared with the rest of the process; close_clients()
+        # releases the pool at shutdown
+        self.client = None
@@ -0,0 +1,130 @@
+import math
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from database.repository import LISTING_KEY_FIELD, Property, _chunks, listing_key
+
+# Attributes whose change adds a row to price_history
+TRACKED_FIELDS = (
+    "price",
+    "contract_type",
+    "property_type",
+    "size_m2",
+    "size",
+    "bedrooms",
+    "bedroom",
+    "bathrooms",
+    "parking_spaces",
+    "car_spaces",
+)
+
+
+def _normalize(value):
+    """Makes values comparable across crawls: missing/NaN are None, numbers floats."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    return value
+
+
+def changed_fields(current, new, fields=TRACKED_FIELDS):
+    """Tracked fields whose value differs between the stored and the new listing."""
+    return [
+        field
+        for field in fields
+        if field in new and _normalize(current.get(field)) != _normalize(new[field])
+    ]
+
+
+class PriceHistory:
+    """
+    Listing history: `property_listings` keeps the current state of each listing
+    and `price_history` gets a compact row (the tracked attributes only) when a
+    listing first appears or one of its tracked attributes changes. A re-crawl of
+    unchanged listings adds nothing, and a listing's asking price over time is a
+    single indexed query.
+    """
+
+    def __init__(self, client):
+        self.listings = Property(client)
+        self.price_history = self.listings.db.price_history
+
+    def _history_rows(self, chunk, observed_at):
+        """
+        Diffs a chunk against the stored state with one `$in` query and returns
+        the history rows of the new and changed listings.
+        """
+        latest = {}
+        for property_data in chunk:
+            latest[listing_key(property_data)] = property_data
+
+        projection = {field: 1 for field in (LISTING_KEY_FIELD,) + TRACKED_FIELDS}
+        stored = {
+            document[LISTING_KEY_FIELD]: document
+            for document in self.listings.property_listings.find(
+                {LISTING_KEY_FIELD: {"$in": list(latest)}}, projection
+            )
+        }
+
+        rows = []
+        for key, property_data in latest.items():
+            current = stored.get(key)
+            if current is None:
+                changes = [f for f in TRACKED_FIELDS if f in property_data]
+            else:
+                changes = changed_fields(current, property_data)
+                if not changes:
+                    continue
+            row = {
+                LISTING_KEY_FIELD: key,
+                "observed_at": observed_at,
+                "changed": changes,
+                "is_new": current is None,
+            }
+            for field in TRACKED_FIELDS:
+                if field in property_data:
+                    row[field] = _normalize(property_data[field])
+            if current is not None and "price" in changes:
+                row["previous_price"] = _normalize(current.get("price"))
+            rows.append(row)
+        return rows
+
+    def record(self, properties, chunk_size=1000):
+        """
+        Records a crawl: appends history rows for new and changed listings, then
+        upserts the current state. History is written first, so a failed run
+        never leaves a state change without its history row.
+
+        Returns the upsert counts plus the number of history rows written.
+        """
+        totals = {
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "history_rows": 0,
+        }
+        observed_at = datetime.now()
+
+        for chunk in _chunks(properties, chunk_size):
+            rows = self._history_rows(chunk, observed_at)
+            if rows:
+                try:
+                    result = self.price_history.insert_many(rows, ordered=False)
+                    totals["history_rows"] += len(result.inserted_ids)
+                except BulkWriteError as e:
+                    totals["history_rows"] += e.details.get("nInserted", 0)
+
+            counts = self.listings.upsert_properties(chunk, chunk_size=len(chunk))
+            for key, value in counts.items():
+                totals[key] += value
+
+        return totals
+
+    def history(self, key):
+        """History rows of a listing, oldest first."""
+        return self.price_history.find({LISTING_KEY_FIELD: key}).sort("observed_at", 1)
@@ -0,0 +1,112 @@
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+
+from database.repository import GEO_FIELD, LISTING_KEY_FIELD
+
+# Indexes of housingprices.property_listings
+PROPERTY_LISTINGS_INDEXES = [
+    # Identity of a listing: upserts and dedupe checks are point lookups. Partial,
+    # so snapshots inserted before listing keys existed do not collide on null
+    IndexModel(
+        [(LISTING_KEY_FIELD, ASCENDING)],
+        name="listing_key_unique",
+        unique=True,
+        partialFilterExpression={LISTING_KEY_FIELD: {"$exists": True}},
+    ),
+    # GeoJSON point built from the geocoded latitude/longitude
+    IndexModel([(GEO_FIELD, GEOSPHERE)], name="geo_2dsphere"),
+    # Price statistics and listings filtered by source, contract and property type,
+    # newest first
+    IndexModel(
+        [
+            ("data_source", ASCENDING),
+            ("contract_type", ASCENDING),
+            ("property_type", ASCENDING),
+            ("timestamp", DESCENDING),
+        ],
+        name="source_contract_property_timestamp",
+    ),
+]
+
+# Indexes of housingprices.price_history: one listing's rows, in time order
+PRICE_HISTORY_INDEXES = [
+    IndexModel(
+        [(LISTING_KEY_FIELD, ASCENDING), ("observed_at", ASCENDING)],
+        name="listing_key_observed_at",
+    ),
+]
+
+
+def ensure_indexes(collection, indexes=None):
+    """
+    Creates the indexes the collection is missing. Existing indexes with the same
+    definition are left untouched, so it is safe to run on every deploy.
+    """
+    indexes = PROPERTY_LISTINGS_INDEXES if indexes is None else indexes
+    return collection.create_indexes(indexes)
+
+
+def _used_indexes(plan):
+    """Collects the index names used by an explain() winning plan."""
+    names = set()
+    if isinstance(plan, dict):
+        if "indexName" in plan:
+            names.add(plan["indexName"])
+        for value in plan.values():
+            names |= _used_indexes(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            names |= _used_indexes(value)
+    return names
+
+
+def check_index_usage(repository):
+    """
+    Runs explain() on the repository's query methods and returns, for each one,
+    the expected index and whether the winning plan used it. A query falling
+    back to a collection scan shows up as `"ok": False`.
+    """
+    queries = {
+        "find_by_listing_key": (
+            repository.property_listings.find({LISTING_KEY_FIELD: ""}).limit(1),
+            "listing_key_unique",
+        ),
+        "find_near": (
+            repository.find_near(latitude=-15.79, longitude=-47.88),
+            "geo_2dsphere",
+        ),
+        "find_listings": (
+            repository.find_listings(
+                data_source="df-imoveis", contract_type="venda", property_type="casa"
+            ),
+            "source_contract_property_timestamp",
+        ),
+    }
+
+    report = {}
+    for query_name, (cursor, expected_index) in queries.items():
+        explanation = cursor.explain()
+        used = _used_indexes(explanation.get("queryPlanner", {}).get("winningPlan"))
+        report[query_name] = {
+            "expected": expected_index,
+            "used": sorted(used),
+            "ok": expected_index in used,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from database.connection import get_client
+    from database.repository import Property
+
+    load_dotenv()
+
+    repository = Property(get_client())
+    print(f"Indexes: {', '.join(ensure_indexes(repository.property_listings))}")
+    ensure_indexes(repository.db.price_history, PRICE_HISTORY_INDEXES)
+    for query_name, result in check_index_usage(repository).items():
+        status = "OK" if result["ok"] else "MISSING"
+        print(
+            f"{status:8} {query_name}: expected {result['expected']}, used {result['used']}"
+        )
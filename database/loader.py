@@ -0,0 +1,159 @@
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+DEFAULT_INPUT = "pipeline/dataset/raw_final_output/merged_properties.tsv"
+
+
+def iter_chunks(path, chunksize=5000, separator="\t"):
+    """
+    Yields the file as DataFrames of at most `chunksize` rows. Parquet files are
+    read one record batch at a time and TSV/CSV files through the chunked reader,
+    so only one chunk is held in memory.
+    """
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, sep=separator, chunksize=chunksize)
+
+
+def frame_to_documents(df):
+    """
+    Converts a chunk into MongoDB documents column by column. Values come out as
+    Python scalars (BSON cannot encode NumPy types) and missing values are
+    dropped from the document instead of being stored as NaN.
+    """
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        values = series.astype(object).where(series.notna(), None).tolist()
+        columns.append((str(col), values))
+
+    documents = []
+    for i in range(len(df)):
+        documents.append(
+            {name: values[i] for name, values in columns if values[i] is not None}
+        )
+    return documents
+
+
+def load_file(
+    repository,
+    path,
+    chunksize=5000,
+    max_in_flight=4,
+    separator="\t",
+    verbose=True,
+    on_documents=None,
+):
+    """
+    Streams a merged TSV/Parquet file into the repository through bulk upserts.
+    At most `max_in_flight` chunks are converted or being written at a time;
+    reading pauses until one of them finishes, so memory stays constant
+    regardless of the file size.
+
+    `on_documents`, when given, is called with the documents of each chunk (e.g.
+    PriceStats.touch to refresh the price rollup afterwards).
+
+    Returns the upsert counts plus the number of documents, elapsed seconds and
+    throughput in documents per second.
+    """
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    documents_loaded = 0
+    start = time.perf_counter()
+
+    def write_chunk(df):
+        documents = frame_to_documents(df)
+        if on_documents is not None:
+            on_documents(documents)
+        return len(documents), repository.upsert_properties(
+            documents, chunk_size=len(documents)
+        )
+
+    def collect(done):
+        nonlocal documents_loaded
+        for future in done:
+            count, result = future.result()
+            documents_loaded += count
+            for key in totals:
+                totals[key] += result.get(key, 0)
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(
+                f"{documents_loaded} documents loaded "
+                f"({documents_loaded / elapsed:,.0f} docs/sec)"
+            )
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        in_flight = set()
+        for df in iter_chunks(path, chunksize=chunksize, separator=separator):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(write_chunk, df))
+        collect(wait(in_flight).done)
+
+    elapsed = time.perf_counter() - start
+    totals.update(
+        {
+            "documents": documents_loaded,
+            "seconds": elapsed,
+            "docs_per_sec": documents_loaded / elapsed if elapsed else 0.0,
+        }
+    )
+    return totals
+
+
+def main():
+    from dotenv import load_dotenv
+
+    from database.connection import get_client
+    from database.repository import Property
+    from database.stats import PriceStats
+
+    parser = argparse.ArgumentParser(
+        description="Load the merged listings file into MongoDB"
+    )
+    parser.add_argument("path", nargs="?", default=DEFAULT_INPUT)
+    parser.add_argument("--chunksize", type=int, default=5000)
+    parser.add_argument("--in-flight", type=int, default=4)
+    parser.add_argument("--separator", default="\t")
+    parser.add_argument(
+        "--refresh-rollup",
+        action="store_true",
+        help="Refresh the price statistics rollup for the groups that were loaded",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        parser.error(f"File not found: {args.path}")
+
+    load_dotenv()
+    repository = Property(get_client())
+    price_stats = PriceStats(repository) if args.refresh_rollup else None
+    result = load_file(
+        repository,
+        args.path,
+        chunksize=args.chunksize,
+        max_in_flight=args.in_flight,
+        separator=args.separator,
+        on_documents=price_stats.touch if price_stats else None,
+    )
+    print(
+        f"Loaded {result['documents']} documents in {result['seconds']:.1f}s "
+        f"({result['docs_per_sec']:,.0f} docs/sec): {result['inserted']} inserted, "
+        f"{result['updated']} updated, {result['unchanged']} unchanged, "
+        f"{result['failed']} failed"
+    )
+    if price_stats is not None:
+        print(f"Refreshed {price_stats.refresh_rollup()} price statistics groups")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,120 @@
+import hashlib
+import json
+import math
+from abc import ABC, abstractmethod
 from datetime import datetime
+from itertools import islice
 
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
-class Property:
-    def __init__(self, client):
+from database.write_behind import WriteBehindSink
+
+LISTING_KEY_FIELD = "listing_key"
+GEO_FIELD = "geo"
+
+# Fields that do not describe the listing itself and are left out of its content hash
+VOLATILE_FIELDS = ("_id", "timestamp", LISTING_KEY_FIELD, GEO_FIELD)
+
+
+def listing_key(property_data):
+    """
+    Stable identity of a listing: its page link when it has one, otherwise a
+    SHA-256 of its contents, so a re-crawl maps the same listing to the same key.
+    """
+    page_link = property_data.get("page_link")
+    if isinstance(page_link, str) and page_link.strip():
+        return page_link.strip()
+
+    content = {k: v for k, v in property_data.items() if k not in VOLATILE_FIELDS}
+    serialized = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def geo_point(latitude, longitude):
+    """
+    GeoJSON point for the geocoded coordinates, or None when they are missing or
+    out of range (a 2dsphere index rejects documents with invalid geometry).
+    """
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (math.isfinite(latitude) and math.isfinite(longitude)):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def _chunks(iterable, size):
+    """Yields lists of up to `size` items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def upsert_documents(chunk):
+    """
+    Maps each listing key of a chunk to the document stored for it: the listing
+    without volatile fields, plus its GeoJSON point when the coordinates are
+    valid. Within a chunk the last occurrence of a key wins.
+    """
+    documents = {}
+    for property_data in chunk:
+        document = {k: v for k, v in property_data.items() if k not in VOLATILE_FIELDS}
+        point = geo_point(property_data.get("latitude"), property_data.get("longitude"))
+        if point is not None:
+            document[GEO_FIELD] = point
+        documents[listing_key(property_data)] = document
+    return documents
+
+
+class ListingRepository(ABC):
+    """
+    Operations every listing store implements, so loaders, sinks and benchmarks
+    work against MongoDB (Property) or the SQLite and in-memory stand-ins in
+    database/backends.py.
+    """
+
+    @abstractmethod
+    def insert_multiple_properties(self, properties_list):
+        """Inserts the listings as new documents."""
+
+    @abstractmethod
+    def upsert_properties(self, properties, chunk_size=1000):
+        """Inserts or updates the listings by listing key and returns the counts."""
+
+    @abstractmethod
+    def find_by_listing_key(self, key):
+        """Returns the listing stored under `key`, or None."""
+
+    @abstractmethod
+    def find_listings(
+        self, data_source=None, contract_type=None, property_type=None, since=None
+    ):
+        """Listings filtered by source, contract and property type, newest first."""
+
+    def write_behind(self, batch_size=1000, flush_interval=2.0, max_queue=10000):
+        """
+        Returns a WriteBehindSink that upserts into this repository from a
+        background thread, keeping database round trips off the caller's thread.
+        """
+        return WriteBehindSink(
+            self,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+        )
+
+
+class Property(ListingRepository):
+    def __init__(self, client, database="housingprices"):
         self.client = client
-        self.db = self.client.housingprices
+        self.db = self.client[database]
         self.property_listings = self.db.property_listings
 
     def insert_property(self, property):
@@ -16,3 +126,83 @@ class Property:
             property_data["timestamp"] = datetime.now()
         result = self.property_listings.insert_many(properties_list)
         return result.inserted_ids
+
+    def _upsert_operations(self, chunk):
+        """
+        Builds one upsert per listing key. The insertion timestamp only goes in
+        `$setOnInsert`, so a listing re-crawled with the same contents is
+        reported as unchanged.
+        """
+        now = datetime.now()
+        return [
+            UpdateOne(
+                {LISTING_KEY_FIELD: key},
+                {"$set": document, "$setOnInsert": {"timestamp": now}},
+                upsert=True,
+            )
+            for key, document in upsert_documents(chunk).items()
+        ]
+
+    def upsert_properties(self, properties, chunk_size=1000):
+        """
+        Inserts new listings and updates changed ones, keyed on `listing_key`.
+        Accepts any iterable of dicts (e.g. a generator over a large file) and
+        sends it in unordered `bulk_write` chunks, so one invalid document does
+        not abort the rest of its chunk.
+
+        Returns the counts of inserted, updated, unchanged and failed listings.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+        for chunk in _chunks(properties, chunk_size):
+            operations = self._upsert_operations(chunk)
+            try:
+                result = self.property_listings.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+                counts["failed"] += len(details.get("writeErrors", []))
+
+            matched = details.get("nMatched", 0)
+            modified = details.get("nModified", 0)
+            counts["inserted"] += details.get("nUpserted", 0)
+            counts["updated"] += modified
+            counts["unchanged"] += matched - modified
+
+        return counts
+
+    def find_by_listing_key(self, key):
+        """Returns the listing stored under `key`, or None."""
+        return self.property_listings.find_one({LISTING_KEY_FIELD: key})
+
+    def find_near(self, latitude, longitude, max_distance_m=1000):
+        """Listings within `max_distance_m` meters of a point, nearest first."""
+        return self.property_listings.find(
+            {
+                GEO_FIELD: {
+                    "$near": {
+                        "$geometry": geo_point(latitude, longitude),
+                        "$maxDistance": max_distance_m,
+                    }
+                }
+            }
+        )
+
+    def find_listings(
+        self, data_source=None, contract_type=None, property_type=None, since=None
+    ):
+        """
+        Listings filtered by source, contract and property type, newest first.
+        `since` keeps only listings first stored at or after that datetime.
+        """
+        query = {}
+        for field, value in (
+            ("data_source", data_source),
+            ("contract_type", contract_type),
+            ("property_type", property_type),
+        ):
+            if value is not None:
+                query[field] = value
+        if since is not None:
+            query["timestamp"] = {"$gte": since}
+        return self.property_listings.find(query).sort("timestamp", -1)
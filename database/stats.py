@@ -0,0 +1,145 @@
+from datetime import datetime
+
+# Dimensions of the regional price statistics (the dashboard's property_type,
+# location and modo)
+GROUP_FIELDS = ("property_type", "region", "contract_type")
+
+ROLLUP_COLLECTION = "price_stats_rollup"
+
+# price_m2 as stored, or computed from price and size_m2
+PRICE_M2 = {
+    "$ifNull": [
+        "$price_m2",
+        {
+            "$cond": [
+                {
+                    "$and": [
+                        {"$isNumber": "$price"},
+                        {"$isNumber": "$size_m2"},
+                        {"$gt": ["$size_m2", 0]},
+                    ]
+                },
+                {"$divide": ["$price", "$size_m2"]},
+                None,
+            ]
+        },
+    ]
+}
+
+
+def _filters(**values):
+    """Equality filters for the values that were given."""
+    return {field: value for field, value in values.items() if value is not None}
+
+
+def price_stats_pipeline(match=None, group_fields=GROUP_FIELDS):
+    """
+    Aggregation pipeline computing count, mean, median, standard deviation, min
+    and max of price_m2 per group. Listings without a positive numeric price
+    and size are left out. `$median` requires MongoDB 7.0 or later.
+    """
+    return [
+        {"$match": dict(match or {}, price={"$gt": 0})},
+        {"$project": {**{field: 1 for field in group_fields}, "price_m2": PRICE_M2}},
+        {"$match": {"price_m2": {"$type": "number", "$gt": 0}}},
+        {
+            "$group": {
+                # $ifNull keeps missing fields as null, so every _id has all keys
+                "_id": {
+                    field: {"$ifNull": [f"${field}", None]} for field in group_fields
+                },
+                "count": {"$sum": 1},
+                "mean": {"$avg": "$price_m2"},
+                "median": {"$median": {"input": "$price_m2", "method": "approximate"}},
+                "std": {"$stdDevSamp": "$price_m2"},
+                "min": {"$min": "$price_m2"},
+                "max": {"$max": "$price_m2"},
+            }
+        },
+        {
+            "$project": {
+                **{field: f"$_id.{field}" for field in group_fields},
+                "count": 1,
+                **{
+                    stat: {"$round": [f"${stat}", 2]}
+                    for stat in ("mean", "median", "std", "min", "max")
+                },
+            }
+        },
+    ]
+
+
+class PriceStats:
+    """
+    Regional price_m2 statistics computed by MongoDB instead of the client.
+    `regional_stats` and `table_stats` aggregate the listings on demand; the
+    rollup collection keeps one precomputed row per (property_type, region,
+    contract_type), refreshed after each load for the groups it touched.
+    """
+
+    def __init__(self, repository):
+        self.listings = repository.property_listings
+        self.rollup_collection = repository.db[ROLLUP_COLLECTION]
+        self.touched = set()
+
+    def regional_stats(self, property_type=None, contract_type=None, region=None):
+        """Statistics per property type, region and contract type."""
+        match = _filters(
+            property_type=property_type, contract_type=contract_type, region=region
+        )
+        return list(self.listings.aggregate(price_stats_pipeline(match)))
+
+    def table_stats(self, contract_type=None):
+        """Statistics per property type and contract type (no regional split)."""
+        pipeline = price_stats_pipeline(
+            _filters(contract_type=contract_type),
+            group_fields=("property_type", "contract_type"),
+        )
+        pipeline.append({"$sort": {"contract_type": -1, "property_type": 1}})
+        return list(self.listings.aggregate(pipeline))
+
+    def touch(self, documents):
+        """Records the groups of loaded documents for the next rollup refresh."""
+        for document in documents:
+            self.touched.add(tuple(document.get(field) for field in GROUP_FIELDS))
+
+    def refresh_rollup(self, full=False):
+        """
+        Recomputes the rollup rows of the touched groups (or of every group with
+        `full=True`) and merges them into the rollup collection. Groups left
+        without listings are removed. Returns the number of groups refreshed.
+        """
+        if not full and not self.touched:
+            return 0
+
+        group_ids = [dict(zip(GROUP_FIELDS, group)) for group in self.touched]
+        scope = {} if full else {"_id": {"$in": group_ids}}
+        # BSON dates have millisecond precision
+        now = datetime.now()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+        pipeline = price_stats_pipeline({} if full else {"$or": group_ids})
+        pipeline += [
+            {"$set": {"refreshed_at": now}},
+            {
+                "$merge": {
+                    "into": ROLLUP_COLLECTION,
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        self.listings.aggregate(pipeline)
+
+        # Rows not rewritten by this refresh belong to groups without listings
+        self.rollup_collection.delete_many(dict(scope, refreshed_at={"$lt": now}))
+        self.touched.clear()
+        return self.rollup_collection.count_documents(scope)
+
+    def rollup(self, property_type=None, contract_type=None, region=None):
+        """Precomputed statistics from the rollup collection."""
+        query = _filters(
+            property_type=property_type, contract_type=contract_type, region=region
+        )
+        return list(self.rollup_collection.find(query, {"_id": 0}))
@@ -0,0 +1,113 @@
+import atexit
+import queue
+import threading
+import time
+
+from database.loader import frame_to_documents
+
+# Marks the end of the stream in the queue
+_STOP = object()
+
+
+class WriteBehindSink:
+    """
+    Write-behind sink for a repository: callers enqueue documents and return
+    immediately, while a dedicated writer thread coalesces them into bulk upserts
+    of up to `batch_size` documents, flushing at least every `flush_interval`
+    seconds. The queue is bounded, so a slow database pauses producers instead of
+    growing memory without limit.
+
+    Pending documents are drained on close(), when leaving a `with` block (also
+    on KeyboardInterrupt) and at interpreter exit.
+    """
+
+    def __init__(
+        self, repository, batch_size=1000, flush_interval=2.0, max_queue=10000
+    ):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.stats = {
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+        self.errors = []
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="mongo-write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, document):
+        """Enqueues one document, blocking while the queue is full."""
+        if self._closed:
+            raise RuntimeError("Write-behind sink is closed")
+        self.queue.put(document)
+
+    def put_many(self, documents):
+        """Enqueues several documents."""
+        for document in documents:
+            self.put(document)
+
+    def put_frame(self, df):
+        """Enqueues the rows of a DataFrame as documents."""
+        self.put_many(frame_to_documents(df))
+
+    def _flush(self, buffer):
+        """Writes the buffered documents in one bulk upsert."""
+        if not buffer:
+            return
+        try:
+            counts = self.repository.upsert_properties(buffer, chunk_size=len(buffer))
+            for key, value in counts.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+        except Exception as e:
+            # Keep the writer alive; the documents are reported as failed
+            self.stats["failed"] += len(buffer)
+            self.errors.append(e)
+            print(f"Write-behind flush of {len(buffer)} documents failed: {e}")
+        self.stats["flushes"] += 1
+
+    def _run(self):
+        """Writer loop: gathers documents until the batch is full or the interval ends."""
+        buffer = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(buffer)
+                return
+            if item is not None:
+                buffer.append(item)
+
+            if len(buffer) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(buffer)
+                buffer = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self, timeout=None):
+        """Stops accepting documents, drains the queue and waits for the writer."""
+        if self._closed:
+            return self.stats
+        self._closed = True
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+        return self.stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -1,25 +1,158 @@
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Fingerprint of a missing value when nulls compare equal, so NaN, None and
+# pd.NA all hash the same
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+NULL_POLICIES = ("equal", "distinct", "drop")
+
+
+def _canonical_text(value: Any) -> Any:
+    """Hashable stand-in for lists, dicts and sets (key and element order ignored)."""
+    if isinstance(value, (list, tuple, dict, set)):
+        if isinstance(value, set):
+            value = sorted(value, key=repr)
+        return json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return value
+
+
+def _column_hashes(series: pd.Series) -> np.ndarray:
+    """64-bit hash of every value of a column."""
+    try:
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        # Unhashable values (lists, dicts) are hashed by their canonical JSON
+        hashes = pd.util.hash_pandas_object(
+            series.map(_canonical_text), index=False
+        ).to_numpy()
+    return np.where(series.isna().to_numpy(), _NULL_HASH, hashes)
+
+
+def row_fingerprints(df: pd.DataFrame, subset: Optional[List[str]] = None) -> pd.Series:
+    """
+    Vectorized 64-bit fingerprint of each row over the subset columns (all columns
+    by default). Columns are combined in sorted name order, so column order does
+    not matter, and missing values of any kind hash alike. Distinct rows collide
+    with probability about n² / 2^65, negligible for millions of rows.
+    """
+    columns = sorted(subset if subset is not None else df.columns, key=str)
+    if not columns:
+        return pd.Series(np.full(len(df), _NULL_HASH), index=df.index)
+    hashes = pd.DataFrame(
+        {i: _column_hashes(df[col]) for i, col in enumerate(columns)}, index=df.index
+    )
+    return pd.util.hash_pandas_object(hashes, index=False)
+
+
+def _blank(df: pd.DataFrame) -> pd.DataFrame:
+    """Mask of missing values and blank strings. Zeros and False are values."""
+    mask = df.isna()
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            mask[col] |= df[col].astype("string").str.strip().eq("").fillna(False)
+    return mask
 
 
 class DataCleaner:
-    def __init__(self, data: List[Dict[str, Any]]):
-        self.data = data
-
-    def remove_duplicates(self) -> None:
-        seen = set()
-        new_data = []
-        for d in self.data:
-            t = tuple(d.items())
-            if t not in seen:
-                seen.add(t)
-                new_data.append(d)
-        self.data = new_data
-
-    def remove_empty_values(self) -> None:
-        self.data = [d for d in self.data if all(d.values())]
-
-    def clean_data(self, standard_keys: List[str]) -> List[Dict[str, Any]]:
-        self.remove_duplicates()
-        self.remove_empty_values()
+    """
+    DataFrame-native cleaning of listings. Accepts a DataFrame or a list of dicts;
+    `data` returns the cleaned rows in the same form (the original dicts, for a
+    list). `stats` counts the rows removed at each step.
+    """
+
+    def __init__(self, data: Union[pd.DataFrame, List[Dict[str, Any]]]):
+        if isinstance(data, pd.DataFrame):
+            self._records = None
+            self.frame = data.reset_index(drop=True)
+        else:
+            self._records = list(data)
+            self.frame = pd.DataFrame.from_records(self._records)
+        self.stats = {"input_rows": len(self.frame)}
+
+    @property
+    def data(self) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        if self._records is None:
+            return self.frame.reset_index(drop=True)
+        # The frame keeps the positions of the records it came from
+        return [self._records[i] for i in self.frame.index]
+
+    def remove_duplicates(
+        self,
+        subset: Optional[List[str]] = None,
+        keep: Union[str, bool] = "first",
+        nulls: str = "equal",
+    ) -> Dict[str, int]:
+        """
+        Removes rows whose fingerprint over subset (all columns by default) was
+        already seen. keep is "first", "last" or False (drop every copy). nulls
+        decides rows with a missing key value: "equal" compares them like any
+        value, "distinct" never treats them as duplicates and "drop" removes them.
+        Returns the number of rows removed for duplicates and for null keys.
+        """
+        if nulls not in NULL_POLICIES:
+            raise ValueError(f"nulls must be one of {NULL_POLICIES}, got {nulls!r}")
+        if subset is not None:
+            missing = [col for col in subset if col not in self.frame.columns]
+            if missing:
+                raise KeyError(f"Columns not found: {missing}")
+
+        key_columns = list(subset) if subset is not None else list(self.frame.columns)
+        null_keys = self.frame[key_columns].isna().any(axis=1)
+        removed = {"duplicates": 0, "null_keys": 0}
+
+        if nulls == "drop":
+            removed["null_keys"] = int(null_keys.sum())
+            self.frame = self.frame[~null_keys]
+            null_keys = null_keys[~null_keys]
+
+        duplicated = row_fingerprints(self.frame, key_columns).duplicated(keep=keep)
+        if nulls == "distinct":
+            duplicated &= ~null_keys
+        removed["duplicates"] = int(duplicated.sum())
+        self.frame = self.frame[~duplicated.to_numpy()]
+
+        for key, count in removed.items():
+            self.stats[key] = self.stats.get(key, 0) + count
+        return removed
+
+    def remove_empty_values(self, required: Optional[List[str]] = None) -> int:
+        """
+        Removes rows missing a value (null or blank text) in any of the required
+        columns (all columns by default). Zeros and False count as values.
+        Returns the number of rows removed.
+        """
+        columns = [
+            col
+            for col in (required if required is not None else self.frame.columns)
+            if col in self.frame.columns
+        ]
+        # A required column absent from the data leaves every row without it
+        absent = required is not None and len(columns) < len(required)
+        if absent:
+            empty = pd.Series(True, index=self.frame.index)
+        else:
+            empty = _blank(self.frame[columns]).any(axis=1)
+
+        removed = int(empty.sum())
+        self.frame = self.frame[~empty.to_numpy()]
+        self.stats["empty_values"] = self.stats.get("empty_values", 0) + removed
+        return removed
+
+    def clean_data(
+        self,
+        standard_keys: Optional[List[str]] = None,
+        keep: Union[str, bool] = "first",
+    ) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Removes duplicate rows, then rows missing any of the standard keys (any
+        column, when none are given). Counts end up in stats.
+        """
+        self.remove_duplicates(keep=keep)
+        self.remove_empty_values(standard_keys)
+        self.stats["output_rows"] = len(self.frame)
 
         return self.data
@@ -0,0 +1,262 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from pipeline.regions import classify_regions
+
+# Canonical column -> column names used by the scrapers, in order of preference.
+# When a file has more than one of them (e.g. df-imoveis writes both size_m2 and
+# size), the first non-null value wins.
+COLUMN_ALIASES: Dict[str, List[str]] = {
+    "data_source": ["data_source", "source"],
+    "contract_type": ["contract_type", "tipo", "modo"],
+    "property_type": ["property_type", "type"],
+    "page_link": ["page_link", "link", "url"],
+    "title": ["title", "Título"],
+    "description": ["description", "Descrição"],
+    "address": ["address", "full_address", "Endereço", "endereco"],
+    "region": ["region", "location"],
+    "price": ["price", "Preço", "preco", "valor"],
+    "size_m2": ["size_m2", "size", "Área", "area"],
+    "bedrooms": ["bedrooms", "bedroom", "Quartos", "quartos", "rooms"],
+    "bathrooms": ["bathrooms", "Banheiros", "banheiros"],
+    "parking_spaces": ["parking_spaces", "car_spaces", "Vagas", "vagas", "parking"],
+    "condo_fee_iptu": ["condo_fee_iptu", "Condomínio e IPTU"],
+    "amenities": ["amenities", "Amenidades"],
+    "latitude": ["latitude", "lat"],
+    "longitude": ["longitude", "lon", "lng"],
+    # Set by partitioned datasets; flat files leave it empty
+    "crawl_date": ["crawl_date"],
+}
+
+# Per-source overrides: entries here replace the aliases of the same canonical
+# column in COLUMN_ALIASES, for sources whose column names mean something else
+SOURCE_COLUMN_ALIASES: Dict[str, Dict[str, List[str]]] = {}
+
+# Canonical columns holding numbers, possibly scraped as text ("R$ 1.200.000",
+# "120 m²", "3 quartos")
+NUMERIC_COLUMNS = [
+    "price",
+    "size_m2",
+    "bedrooms",
+    "bathrooms",
+    "parking_spaces",
+    "latitude",
+    "longitude",
+]
+
+# Spellings of the contract types
+CONTRACT_TYPES = {
+    "venda": "venda",
+    "comprar": "venda",
+    "compra": "venda",
+    "sale": "venda",
+    "aluguel": "aluguel",
+    "alugar": "aluguel",
+    "locacao": "aluguel",
+    "locação": "aluguel",
+    "rent": "aluguel",
+}
+
+# Numeric columns that get a <col>_status column telling how they were parsed
+STATUS_COLUMNS = ["price", "size_m2"]
+
+# Parse outcomes, in order of precedence
+PARSE_STATUSES = ("missing", "on_request", "numeric", "range", "parsed", "invalid")
+
+_NUMBER_RE = r"(?P<number>-?\d[\d.,]*)"
+_THOUSANDS_ONLY_RE = r"^-?\d{1,3}(?:\.\d{3})+$"
+# "2 a 3 quartos", "de 150 até 200 m²", "2-3": the first number is kept
+_RANGE_RE = r"\d\s*(?:m²|m2)?\s*(?:a|até|ate|-|–)\s*\d"
+_ON_REQUEST_RE = r"sob\s+consulta|consulte|a\s+combinar"
+_MULTIPLIER_RE = r"\d\s*(?P<multiplier>mil|mi|milh[aã]o|milh[oõ]es)\b"
+_MULTIPLIERS = {
+    "mil": 1e3,
+    "mi": 1e6,
+    "milhao": 1e6,
+    "milhão": 1e6,
+    "milhoes": 1e6,
+    "milhões": 1e6,
+}
+
+
+def parse_number_column(series: pd.Series) -> pd.DataFrame:
+    """
+    Vectorized parse of a scraped numeric column. Text values keep their first
+    number, read in Brazilian notation ("R$ 1.200.000,50", "120 m²") and scaled
+    by "mil" / "mi(lhões)"; ranges ("2 a 3 quartos") keep their lower bound.
+    Returns the float64 "value" and a "status" per cell (see PARSE_STATUSES):
+    "on_request" for prices like "Sob Consulta", "invalid" for text without a
+    number.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        value = series.astype("float64")
+        status = pd.Series("numeric", index=series.index).mask(value.isna(), "missing")
+        return pd.DataFrame({"value": value, "status": status})
+
+    # Numbers mixed into text columns are stringified too ("1200.0" reads back as
+    # 1200.0, since a dot not followed by groups of 3 digits is a decimal point).
+    # The work runs on Arrow's string kernels, which process the whole column in
+    # native code.
+    text = pa.array(series.astype("string"), type=pa.large_string())
+    if isinstance(text, pa.ChunkedArray):
+        text = text.combine_chunks()
+    text = pc.utf8_trim_whitespace(text)
+    lowered = pc.utf8_lower(text)
+
+    token = pc.struct_field(pc.extract_regex(text, _NUMBER_RE), [0])
+    token = pc.utf8_rtrim(token, characters=".,")
+    grouped = pc.or_(
+        pc.match_substring(token, ","),
+        pc.match_substring_regex(token, _THOUSANDS_ONLY_RE),
+    )
+    normalized = pc.if_else(grouped, pc.replace_substring(token, ".", ""), token)
+    normalized = pc.replace_substring(normalized, ",", ".")
+    value = pd.to_numeric(
+        pd.Series(normalized.to_numpy(zero_copy_only=False), index=series.index),
+        errors="coerce",
+    ).astype("float64")
+
+    multiplier = pc.struct_field(pc.extract_regex(lowered, _MULTIPLIER_RE), [0])
+    scale = pc.take(
+        pa.array(list(_MULTIPLIERS.values()) + [1.0]),
+        pc.fill_null(
+            pc.index_in(multiplier, pa.array(list(_MULTIPLIERS))), len(_MULTIPLIERS)
+        ),
+    )
+    value = value * scale.to_numpy(zero_copy_only=False)
+
+    def mask(condition):
+        return pc.fill_null(condition, False).to_numpy(zero_copy_only=False)
+
+    conditions = [
+        mask(pc.equal(text, "")) | series.isna().to_numpy(),
+        mask(pc.match_substring_regex(lowered, _ON_REQUEST_RE)),
+        mask(pc.match_substring_regex(lowered, _RANGE_RE)) & value.notna().to_numpy(),
+        value.notna().to_numpy(),
+    ]
+    status = pd.Series(
+        np.select(conditions, ["missing", "on_request", "range", "parsed"], "invalid"),
+        index=series.index,
+        dtype=object,
+    )
+    value = value.mask(status.isin(["missing", "on_request"]))
+    return pd.DataFrame({"value": value, "status": status})
+
+
+def parse_numbers(series: pd.Series) -> pd.Series:
+    """Float64 values of a scraped numeric column (see parse_number_column)."""
+    return parse_number_column(series)["value"]
+
+
+def numeric_source_columns() -> List[str]:
+    """
+    Column names the scrapers use for NUMERIC_COLUMNS, over every source. Readers
+    keep them as text, since type inference would read "1.500" (R$ 1.500) as 1.5
+    before parse_number_column sees it.
+    """
+    names = {name for col in NUMERIC_COLUMNS for name in COLUMN_ALIASES[col]}
+    for overrides in SOURCE_COLUMN_ALIASES.values():
+        for col in NUMERIC_COLUMNS:
+            names.update(overrides.get(col, []))
+    return sorted(names)
+
+
+def _normalize_contract_type(series: pd.Series) -> pd.Series:
+    """Maps contract type spellings to "venda" / "aluguel"; others are kept lowercased."""
+    lowered = series.astype("string").str.strip().str.lower()
+    return lowered.map(CONTRACT_TYPES).fillna(lowered).astype(object)
+
+
+def harmonize_listings(
+    df: pd.DataFrame, data_source: str = None, keep_extra: bool = False
+) -> pd.DataFrame:
+    """
+    Maps a source's columns to the canonical listing columns, coalescing aliases,
+    and normalizes units: numbers scraped as text become floats, with a
+    <col>_status column for STATUS_COLUMNS, and contract types share one
+    spelling. Columns outside the canonical set are dropped unless keep_extra is
+    set. Listings without a region get the administrative
+    region named in their address or description (see pipeline.regions).
+    """
+    aliases = dict(COLUMN_ALIASES)
+    aliases.update(SOURCE_COLUMN_ALIASES.get(data_source, {}))
+
+    harmonized = {}
+    used = set()
+    for canonical, names in aliases.items():
+        present = [name for name in names if name in df.columns]
+        if not present:
+            continue
+        column = df[present[0]]
+        for name in present[1:]:
+            column = column.combine_first(df[name])
+        harmonized[canonical] = column
+        used.update(present)
+
+    result = pd.DataFrame(harmonized, index=df.index)
+    if keep_extra:
+        for col in df.columns:
+            if col not in used:
+                result[col] = df[col]
+
+    for col in NUMERIC_COLUMNS:
+        if col in result.columns:
+            parsed = parse_number_column(result[col])
+            result[col] = parsed["value"]
+            if col in STATUS_COLUMNS:
+                result[f"{col}_status"] = parsed["status"]
+
+    if "contract_type" in result.columns:
+        result["contract_type"] = _normalize_contract_type(result["contract_type"])
+
+    if data_source is not None:
+        result["data_source"] = data_source
+
+    # Blank text is as good as missing
+    for col in result.columns:
+        if result[col].dtype == object or pd.api.types.is_string_dtype(result[col]):
+            blank = result[col].astype("string").str.strip().eq("").fillna(False)
+            result[col] = result[col].mask(blank)
+
+    if "address" in result.columns or "description" in result.columns:
+        region = classify_regions(result)
+        if "region" in result.columns:
+            region = result["region"].astype(object).combine_first(region)
+        result["region"] = region
+
+    return result.reset_index(drop=True)
+
+
+def canonical_arrow_schema() -> pa.Schema:
+    """
+    Arrow schema of harmonized listings: float64 for the numeric columns and
+    strings for the rest. Streaming writers use it so every chunk has the same
+    columns and types, whatever the source.
+    """
+    return pa.schema(
+        [
+            (col, pa.float64() if col in NUMERIC_COLUMNS else pa.string())
+            for col in COLUMN_ALIASES
+        ]
+        + [(f"{col}_status", pa.string()) for col in STATUS_COLUMNS]
+    )
+
+
+def conform_to_schema(df: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    """Converts a harmonized chunk to the schema, adding missing columns as nulls."""
+    columns = []
+    for field in schema:
+        if field.name not in df.columns:
+            columns.append(pa.nulls(len(df), type=field.type))
+            continue
+        series = df[field.name]
+        if pa.types.is_floating(field.type):
+            columns.append(pa.array(series.astype("float64"), type=field.type))
+        else:
+            text = series.astype("string").astype(object).where(series.notna(), None)
+            columns.append(pa.array(text, type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
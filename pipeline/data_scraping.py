@@ -1,9 +1,159 @@
 import glob
+import hashlib
+import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from pipeline.data_harmonization import (
+    canonical_arrow_schema,
+    conform_to_schema,
+    harmonize_listings,
+    numeric_source_columns,
+)
+from pipeline.near_duplicates import cluster_near_duplicates
+from pipeline.outliers import filter_outliers
+from pipeline.validation import validate_listings
+from utils.checkpoint import atomic_write
+from utils.data_handler import sanitize_text_columns
+from utils.partitioned_dataset import PARTITIONS_MANIFEST, PartitionedDataset
+from utils.schema import apply_listing_schema
+from utils.segment_store import SegmentStore, _file_sha256
+
+# Rows per worksheet supported by Excel, header included
+EXCEL_MAX_ROWS = 1_048_576
+
+# Incremental merge state kept in the output folder
+MERGE_MANIFEST = "_merge_manifest.json"
+MERGED_PARTS_DIR = "merged_parts"
+
+# Columns read from the detailed_properties files of a partitioned scraper
+DESCRIPTION_COLUMNS = ("page_link", "description")
+
+
+def _numeric_text_dtypes() -> Dict[str, type]:
+    """ read_csv dtypes keeping the columns of numeric_source_columns as text. """
+    return {name: str for name in numeric_source_columns()}
+
+
+def read_data_file(
+    file_path: str, data_source: str, csv_engine: str = "c", harmonize: bool = True
+) -> pa.Table:
+    """
+    Read one scraped TSV or XLSX file into an Arrow table with its data_source.
+    Module-level so it can run in a worker process; with csv_engine="pyarrow",
+    TSV files are parsed by the multithreaded Arrow CSV reader. With harmonize,
+    the columns are mapped to the canonical listing schema while still per file.
+    """
+    if file_path.endswith(".tsv") and csv_engine == "pyarrow":
+        table = pa_csv.read_csv(
+            file_path,
+            parse_options=pa_csv.ParseOptions(delimiter="\t"),
+            # Empty fields are missing values, as with pandas; numbers stay as
+            # scraped for harmonization to parse
+            convert_options=pa_csv.ConvertOptions(
+                strings_can_be_null=True,
+                column_types={name: pa.string() for name in numeric_source_columns()},
+            ),
+        )
+        if not harmonize:
+            return table.append_column(
+                "data_source",
+                pa.array([data_source] * table.num_rows, type=pa.string()),
+            )
+        df = table.to_pandas()
+    elif file_path.endswith(".tsv"):
+        df = pd.read_csv(file_path, sep="\t", dtype=_numeric_text_dtypes())
+    else:
+        df = pd.read_excel(file_path)
+
+    if harmonize:
+        df = harmonize_listings(df, data_source)
+    else:
+        df["data_source"] = data_source
+    return SegmentStore._to_arrow_table(df)
+
+
+def iter_data_file_chunks(file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield a TSV or XLSX file as DataFrames of at most chunksize rows. XLSX sheets
+    are read row by row in openpyxl's read-only mode, so no file is held whole.
+    """
+    if file_path.endswith(".tsv"):
+        yield from pd.read_csv(
+            file_path, sep="\t", dtype=_numeric_text_dtypes(), chunksize=chunksize
+        )
+        return
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process so far, in MiB. NaN where the resource
+    module does not exist (Windows), so importing the pipeline never depends on it.
+    """
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """
+    Concatenate Arrow tables without copying their buffers. Missing columns are
+    filled with nulls and numeric types are widened; columns whose types still
+    conflict between files (e.g. numbers in one, text in another) become strings.
+    """
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        types = {}
+        for table in tables:
+            for field in table.schema:
+                types.setdefault(field.name, set()).add(field.type)
+        conflicting = {
+            name for name, field_types in types.items() if len(field_types) > 1
+        }
+        cast_tables = []
+        for table in tables:
+            for name in conflicting & set(table.column_names):
+                index = table.schema.get_field_index(name)
+                table = table.set_column(
+                    index, name, table.column(name).cast(pa.string())
+                )
+            cast_tables.append(table)
+        return pa.concat_tables(cast_tables, promote_options="permissive")
+
 
 class ScraperOrchestrator:
     """
@@ -11,22 +161,71 @@ class ScraperOrchestrator:
     Finds and processes TSV and XLSX files in the detailed_properties folders of each scraper.
     """
 
-    def __init__(self, base_scripts_dir: str = None):
-        """ Initialize the scraper orchestrator """
+    def __init__(
+        self,
+        base_scripts_dir: str = None,
+        use_partitions: bool = False,
+        partition_filters: Dict[str, Any] = None,
+        workers: int = 1,
+        csv_engine: str = "c",
+        harmonize: bool = True,
+    ):
+        """
+        Initialize the scraper orchestrator.
+        With use_partitions, scrapers that keep a partitioned dataset (dataset/partitions)
+        are loaded from it, pruned by partition_filters, instead of from their flat files.
+        With workers > 1, discovered files are parsed in parallel by a process pool;
+        csv_engine="pyarrow" parses TSV files with the Arrow CSV reader.
+        With harmonize, each source's columns and units are mapped to the canonical
+        listing columns (see pipeline/data_harmonization.py) as files and partitions
+        are loaded; columns outside the canonical set are dropped on every path.
+        """
 
         if base_scripts_dir is None:
             self.scripts_dir = os.path.join(Path(__file__).parent.parent, "scripts")
         else:
             self.scripts_dir = base_scripts_dir
 
+        self.use_partitions = use_partitions
+        self.partition_filters = partition_filters or {}
+        self.workers = workers
+        self.csv_engine = csv_engine
+        self.harmonize = harmonize
+
         self.tsv_files = []
         self.xlsx_files = []
+        self.skipped_xlsx_files = []
+        self.partition_roots = []
+        self.partition_detail_files = {}
+        self.file_sources = {}
+        self.timings = {}
+
+    @contextmanager
+    def _phase(self, name: str):
+        """ Record the wall time spent in a pipeline phase. """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
 
     def discover_data_files(self) -> Dict[str, List[str]]:
-        """ Discover all TSV and XLSX files in detailed_properties folders. """
+        """
+        Discover all TSV and XLSX files in detailed_properties folders. With
+        use_partitions, a scraper's partitions replace its flat files, and the TSV
+        files of its detailed_properties folder are kept aside only for the
+        descriptions they add (see _partition_descriptions).
+        """
 
         self.tsv_files = []
         self.xlsx_files = []
+        self.skipped_xlsx_files = []
+        self.partition_roots = []
+        self.partition_detail_files = {}
+        self.file_sources = {}
 
         scraper_dirs = [
             d
@@ -41,31 +240,195 @@ class ScraperOrchestrator:
             if not os.path.exists(dataset_path):
                 continue
 
+            partitions_root = os.path.join(dataset_path, "partitions")
             detailed_props_path = os.path.join(dataset_path, "detailed_properties")
+            if os.path.exists(os.path.join(partitions_root, PARTITIONS_MANIFEST)):
+                self.partition_roots.append(partitions_root)
+                if self.use_partitions:
+                    print(f"Found partitioned dataset in {scraper}")
+                    self.partition_detail_files[partitions_root] = sorted(
+                        glob.glob(os.path.join(detailed_props_path, "*.tsv"))
+                    )
+                    continue
 
             if not os.path.exists(detailed_props_path):
                 self._find_data_files(dataset_path, scraper)
             else:
                 self._find_data_files(detailed_props_path, scraper)
 
-        return {"tsv": self.tsv_files, "xlsx": self.xlsx_files}
+        return {
+            "tsv": self.tsv_files,
+            "xlsx": self.xlsx_files,
+            "partitions": self.partition_roots,
+            "partition_details": [
+                path for paths in self.partition_detail_files.values() for path in paths
+            ],
+        }
+
+    def discover_partitions(self, **filters) -> List[Dict[str, Any]]:
+        """
+        List the partitions of every discovered partitioned dataset that match the
+        filters (source, contract_type, property_type, crawl_date or "latest"),
+        reading only the manifests.
+        """
+        entries = []
+        for root in self.partition_roots:
+            for entry in PartitionedDataset(root).partitions(**filters):
+                entries.append({**entry, "dataset_root": root})
+        return entries
+
+    def _partition_descriptions(self, root: str) -> pd.Series:
+        """
+        Descriptions of a partitioned scraper's listings by page_link, from the
+        detailed_properties files discovered next to its partitions. Those files
+        repeat the raw listings, so only their descriptions are used.
+        """
+        frames = []
+        for file_path in self.partition_detail_files.get(root, []):
+            df = pd.read_csv(
+                file_path, sep="\t", usecols=lambda col: col in DESCRIPTION_COLUMNS
+            )
+            if len(df.columns) == len(DESCRIPTION_COLUMNS):
+                frames.append(df.dropna())
+        if not frames:
+            return pd.Series(dtype=object)
+        descriptions = pd.concat(frames, ignore_index=True)
+        blank = descriptions["description"].astype(str).str.strip() == ""
+        descriptions = descriptions[~blank]
+        return descriptions.drop_duplicates("page_link", keep="last").set_index(
+            "page_link"
+        )["description"]
+
+    @staticmethod
+    def _attach_descriptions(df: pd.DataFrame, descriptions: pd.Series) -> pd.DataFrame:
+        """ Fill the description of the listings that lack one from the lookup. """
+
+        if descriptions.empty or "page_link" not in df.columns:
+            return df
+        found = df["page_link"].map(descriptions)
+        if "description" in df.columns:
+            found = df["description"].where(df["description"].notna(), found)
+        return df.assign(description=found)
+
+    def merge_partitions(self, **filters) -> pd.DataFrame:
+        """ Load only the partitions matching the filters into a single DataFrame. """
+
+        filters = {**self.partition_filters, **filters}
+        dfs = []
+        for root in self.partition_roots:
+            df = PartitionedDataset(root).read(**filters)
+            if df.empty:
+                continue
+            df["data_source"] = df.pop("source")
+            df = self._attach_descriptions(df, self._partition_descriptions(root))
+            if self.harmonize:
+                df = harmonize_listings(df)
+            dfs.append(df)
+            print(f"Loaded {len(df)} rows from partitions in {root}")
+
+        if not dfs:
+            return pd.DataFrame()
+
+        merged_df = pd.concat(dfs, ignore_index=True)
+        print(f"Merged {len(merged_df)} total rows from partitioned datasets")
+        return merged_df
 
     def _find_data_files(self, search_path: str, scraper_name: str) -> None:
-        """ Find TSV and XLSX files in the given path. """
+        """
+        Find TSV and XLSX files in the given path. An XLSX file is skipped when a TSV
+        of the same batch (same name) exists, since both hold the same rows and the
+        TSV is much faster to parse.
+        """
 
         # Find TSV files
         tsv_pattern = os.path.join(search_path, "*.tsv")
-        found_tsv = glob.glob(tsv_pattern)
+        found_tsv = sorted(glob.glob(tsv_pattern))
         if found_tsv:
             print(f"Found {len(found_tsv)} TSV files in {scraper_name}")
             self.tsv_files.extend(found_tsv)
 
         # Find XLSX files
         xlsx_pattern = os.path.join(search_path, "*.xlsx")
-        found_xlsx = glob.glob(xlsx_pattern)
+        found_xlsx, skipped_xlsx = [], []
+        for file_path in sorted(glob.glob(xlsx_pattern)):
+            if os.path.splitext(file_path)[0] + ".tsv" in found_tsv:
+                skipped_xlsx.append(file_path)
+            else:
+                found_xlsx.append(file_path)
         if found_xlsx:
             print(f"Found {len(found_xlsx)} XLSX files in {scraper_name}")
             self.xlsx_files.extend(found_xlsx)
+        if skipped_xlsx:
+            print(
+                f"Skipped {len(skipped_xlsx)} XLSX files in {scraper_name} "
+                "with a TSV of the same batch"
+            )
+            self.skipped_xlsx_files.extend(skipped_xlsx)
+
+        for file_path in found_tsv + found_xlsx:
+            self.file_sources[file_path] = scraper_name
+
+    def _data_source(self, file_path: str) -> str:
+        """ Name of the scraper a discovered file belongs to. """
+
+        if file_path in self.file_sources:
+            return self.file_sources[file_path]
+        # Files not found by discovery: scripts/<scraper>/dataset[/detailed_properties]/file
+        parts = Path(file_path).parts
+        if "dataset" in parts:
+            return parts[parts.index("dataset") - 1]
+        return os.path.basename(os.path.dirname(os.path.dirname(file_path)))
+
+    def read_tables(self, file_paths: List[str]) -> Dict[str, pa.Table]:
+        """
+        Parse the files into Arrow tables, across a process pool when workers > 1.
+        Files that fail to load are reported and left out.
+        """
+        tables = {}
+
+        def collect(file_path, load):
+            try:
+                table = load()
+                tables[file_path] = table
+                print(f"Loaded {table.num_rows} rows from {file_path}")
+            except Exception as e:
+                print(f"Error loading {file_path}: {str(e)}")
+
+        if self.workers > 1 and len(file_paths) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(
+                        read_data_file,
+                        file_path,
+                        self._data_source(file_path),
+                        self.csv_engine,
+                        self.harmonize,
+                    )
+                    for file_path in file_paths
+                ]
+                for file_path, future in zip(file_paths, futures):
+                    collect(file_path, future.result)
+        else:
+            for file_path in file_paths:
+                collect(
+                    file_path,
+                    lambda: read_data_file(
+                        file_path,
+                        self._data_source(file_path),
+                        self.csv_engine,
+                        self.harmonize,
+                    ),
+                )
+
+        return tables
+
+    def load_tables(self, file_paths: List[str]) -> pa.Table:
+        """ Parse the files and concatenate them into one Arrow table. """
+
+        tables = self.read_tables(file_paths)
+        if not tables:
+            return pa.table({})
+        return concat_tables(list(tables.values()))
 
     def merge_tsv_files(self) -> pd.DataFrame:
         """ Merge all discovered TSV files into a single DataFrame. """
@@ -74,24 +437,12 @@ class ScraperOrchestrator:
             print("No TSV files found to merge.")
             return pd.DataFrame()
 
-        dfs = []
-        for file_path in self.tsv_files:
-            try:
-                df = pd.read_csv(file_path, sep="\t")
-                # Add source information
-                df["data_source"] = os.path.basename(
-                    os.path.dirname(os.path.dirname(file_path))
-                )
-                dfs.append(df)
-                print(f"Loaded {len(df)} rows from {file_path}")
-            except Exception as e:
-                print(f"Error loading {file_path}: {str(e)}")
-
-        if not dfs:
+        merged_table = self.load_tables(self.tsv_files)
+        if merged_table.num_columns == 0:
             return pd.DataFrame()
 
         # Merge all dataframes
-        merged_df = pd.concat(dfs, ignore_index=True)
+        merged_df = merged_table.to_pandas()
         print(f"Merged {len(merged_df)} total rows from TSV files")
         return merged_df
 
@@ -102,115 +453,523 @@ class ScraperOrchestrator:
             print("No XLSX files found to merge.")
             return pd.DataFrame()
 
-        dfs = []
-        for file_path in self.xlsx_files:
-            try:
-                df = pd.read_excel(file_path)
-                # Add source information
-                df["data_source"] = os.path.basename(
-                    os.path.dirname(os.path.dirname(file_path))
-                )
-                dfs.append(df)
-                print(f"Loaded {len(df)} rows from {file_path}")
-            except Exception as e:
-                print(f"Error loading {file_path}: {str(e)}")
-
-        if not dfs:
+        merged_table = self.load_tables(self.xlsx_files)
+        if merged_table.num_columns == 0:
             return pd.DataFrame()
 
         # Merge all dataframes
-        merged_df = pd.concat(dfs, ignore_index=True)
+        merged_df = merged_table.to_pandas()
         print(f"Merged {len(merged_df)} total rows from XLSX files")
         return merged_df
 
-    def get_merged_data(self) -> pd.DataFrame:
+    def _canonical_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Get all merged data from both TSV and XLSX files.
-        This function automatically discovers and merges all available data.
+        With harmonize, every canonical column in canonical order (missing ones
+        empty), which is also what stream_merge writes, so both paths produce the
+        same columns whatever the sources.
         """
-        # Discover all data files
-        self.discover_data_files()
+        if not self.harmonize:
+            return df
+        return df.reindex(columns=canonical_arrow_schema().names)
+
+    def _combine(
+        self, tsv_data: pd.DataFrame, xlsx_data: pd.DataFrame
+    ) -> pd.DataFrame:
+        """ Concatenate the loaded TSV, XLSX and partition data and apply the schema. """
+
+        # Partitioned datasets replace the flat files of their scrapers
+        if self.use_partitions:
+            with self._phase("load_partitions"):
+                partition_data = self.merge_partitions()
+            if not partition_data.empty:
+                tsv_data = pd.concat([tsv_data, partition_data], ignore_index=True)
+
+        with self._phase("merge"):
+            # Merge both sources if both exist
+            if not tsv_data.empty and not xlsx_data.empty:
+                try:
+                    merged_data = pd.concat([tsv_data, xlsx_data], ignore_index=True)
+                    print(
+                        f"Successfully merged {len(tsv_data)} TSV rows and {len(xlsx_data)} XLSX rows"
+                    )
+                except Exception as e:
+                    print(f"Error merging TSV and XLSX data: {str(e)}")
+                    print("Returning TSV data only (preferred format)")
+                    merged_data = tsv_data
+            elif not tsv_data.empty:
+                merged_data = tsv_data
+            elif not xlsx_data.empty:
+                merged_data = xlsx_data
+            else:
+                print("No data files found.")
+                return pd.DataFrame()
 
-        # Merge TSV files
-        tsv_data = self.merge_tsv_files()
+            # Compact typed schema: categoricals, float32/Int16 and Arrow-backed strings
+            return apply_listing_schema(self._canonical_columns(merged_data))
 
-        # Merge XLSX files
-        xlsx_data = self.merge_xlsx_files()
+    def get_merged_data(self, discover: bool = True) -> pd.DataFrame:
+        """
+        Get all merged data from both TSV and XLSX files, reading each file once.
+        This function discovers the data files first unless discover is False.
+        """
+        if discover:
+            with self._phase("discovery"):
+                self.discover_data_files()
+
+        with self._phase("load_tsv"):
+            tsv_data = self.merge_tsv_files()
+
+        with self._phase("load_xlsx"):
+            xlsx_data = self.merge_xlsx_files()
+
+        return self._combine(tsv_data, xlsx_data)
+
+    def _partition_signature(self, root: str) -> str:
+        """ Content hash of the partitions of a dataset that match the filters. """
+
+        digest = hashlib.sha256()
+        for entry in PartitionedDataset(root).partitions(**self.partition_filters):
+            digest.update(f"{entry['path']}:{entry['content_hash']};".encode())
+        # New descriptions change the merged rows too
+        for file_path in self.partition_detail_files.get(root, []):
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}:{stat.st_size}:{stat.st_mtime};".encode())
+        return digest.hexdigest()
+
+    def _read_partition_table(self, root: str) -> pa.Table:
+        """ Load the matching partitions of one dataset as an Arrow table. """
+
+        df = PartitionedDataset(root).read(**self.partition_filters)
+        if "source" in df.columns:
+            df["data_source"] = df.pop("source")
+        df = self._attach_descriptions(df, self._partition_descriptions(root))
+        if self.harmonize:
+            df = harmonize_listings(df)
+        return SegmentStore._to_arrow_table(df)
+
+    def _merge_manifest(self, output_dir: str) -> Dict[str, Any]:
+        """ The incremental merge manifest of output_dir, empty on the first run. """
+
+        manifest_path = os.path.join(output_dir, MERGE_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return {"inputs": {}}
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_merge_manifest(self, output_dir: str, manifest: Dict[str, Any]) -> None:
+        with atomic_write(os.path.join(output_dir, MERGE_MANIFEST)) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def _part_path(output_dir: str, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return os.path.join(output_dir, MERGED_PARTS_DIR, f"part-{name}.parquet")
+
+    def update_merged_parts(self, output_dir: str) -> Dict[str, Any]:
+        """
+        Bring the Parquet parts of output_dir/merged_parts up to date. Every input
+        (a data file, or a partitioned dataset with use_partitions) is kept as its
+        own part, and the manifest records each input's size, mtime and content
+        hash. Inputs whose size and mtime are unchanged are not even hashed;
+        changed inputs are hashed and reloaded only when their content differs,
+        replacing their part; parts of removed inputs are deleted. Turning
+        harmonize on or off reloads every input.
+
+        Returns the reloaded, unchanged and removed inputs, plus an inputs_hash
+        identifying the current content of all inputs. Call discover_data_files()
+        first.
+        """
+        os.makedirs(os.path.join(output_dir, MERGED_PARTS_DIR), exist_ok=True)
+
+        manifest = self._merge_manifest(output_dir)
+        previous = manifest["inputs"]
+        if manifest.get("harmonize", True) != self.harmonize:
+            # Parts hold the columns of the other policy: nothing can be reused
+            previous = {}
+
+        def part_path(key):
+            return self._part_path(output_dir, key)
+
+        def is_current(key, signature):
+            entry = previous.get(key)
+            return (
+                entry is not None
+                and entry["content_hash"] == signature
+                and os.path.exists(part_path(key))
+            )
 
-        # Merge both sources if both exist
-        if not tsv_data.empty and not xlsx_data.empty:
-            try:
-                merged_data = pd.concat([tsv_data, xlsx_data], ignore_index=True)
-                print(
-                    f"Successfully merged {len(tsv_data)} TSV rows and {len(xlsx_data)} XLSX rows"
-                )
-                return merged_data
-            except Exception as e:
-                print(f"Error merging TSV and XLSX data: {str(e)}")
-                print("Returning TSV data only (preferred format)")
-                return tsv_data
-        elif not tsv_data.empty:
-            return tsv_data
-        elif not xlsx_data.empty:
-            return xlsx_data
-        else:
-            print("No data files found.")
-            return pd.DataFrame()
+        inputs = {}
+        to_load = []
+        for file_path in self.tsv_files + self.xlsx_files:
+            key = os.path.abspath(file_path)
+            stat = os.stat(file_path)
+            entry = previous.get(key)
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime
+                and os.path.exists(part_path(key))
+            ):
+                inputs[key] = entry
+                continue
+            content_hash = _file_sha256(file_path)
+            inputs[key] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "content_hash": content_hash,
+                "data_source": self._data_source(file_path),
+            }
+            if is_current(key, content_hash):
+                inputs[key]["rows"] = previous[key].get("rows")
+            else:
+                to_load.append(file_path)
+
+        partition_roots = self.partition_roots if self.use_partitions else []
+        for root in partition_roots:
+            key = f"partitions:{os.path.abspath(root)}"
+            inputs[key] = {"content_hash": self._partition_signature(root)}
+            if not is_current(key, inputs[key]["content_hash"]):
+                to_load.append(root)
+
+        with self._phase("load_changed"):
+            file_paths = [p for p in to_load if p not in partition_roots]
+            tables = {
+                os.path.abspath(path): table
+                for path, table in self.read_tables(file_paths).items()
+            }
+            for root in partition_roots:
+                if root in to_load:
+                    tables[f"partitions:{os.path.abspath(root)}"] = (
+                        self._read_partition_table(root)
+                    )
+
+            for key, table in tables.items():
+                with atomic_write(part_path(key)) as tmp_path:
+                    pq.write_table(table, tmp_path)
+                inputs[key]["rows"] = table.num_rows
+
+        # Inputs that failed to load keep no part and are retried next run
+        for file_path in file_paths:
+            key = os.path.abspath(file_path)
+            if key not in tables:
+                inputs.pop(key, None)
+
+        removed = [key for key in manifest["inputs"] if key not in inputs]
+        for key in removed:
+            if os.path.exists(part_path(key)):
+                os.remove(part_path(key))
+
+        manifest.update({"inputs": inputs, "harmonize": self.harmonize})
+        self._write_merge_manifest(output_dir, manifest)
+
+        inputs_hash = hashlib.sha256()
+        for key in sorted(inputs):
+            inputs_hash.update(f"{key}:{inputs[key]['content_hash']};".encode())
+
+        changes = {
+            "reloaded": sorted(tables),
+            "unchanged": len(inputs) - len(tables),
+            "removed": removed,
+            "inputs_hash": inputs_hash.hexdigest(),
+        }
+        print(
+            f"Incremental merge: {len(tables)} inputs reloaded, "
+            f"{changes['unchanged']} unchanged, {len(removed)} removed"
+        )
+        return changes
+
+    def read_merged_parts(self, output_dir: str) -> pd.DataFrame:
+        """ Concatenate the parts of the inputs in the merge manifest. """
+
+        with self._phase("merge"):
+            part_tables = [
+                pq.read_table(self._part_path(output_dir, key))
+                for key in sorted(self._merge_manifest(output_dir)["inputs"])
+            ]
+            if not part_tables:
+                return pd.DataFrame()
+            merged_data = concat_tables(part_tables).to_pandas()
+            return apply_listing_schema(self._canonical_columns(merged_data))
+
+    def merge_incremental(self, output_dir: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Merge only what changed since the last run: refresh the parts (see
+        update_merged_parts) and concatenate them. Call discover_data_files() first.
+        """
+        changes = self.update_merged_parts(output_dir)
+        return self.read_merged_parts(output_dir), changes
 
-    def save_merged_data_to_files(self, output_dir: str) -> Dict[str, str]:
-        """ Save merged data to TSV and XLSX files in the specified output folder. """
-        # Get merged data
-        tsv_data = self.merge_tsv_files()
-        xlsx_data = self.merge_xlsx_files()
+    def _recorded_outputs(
+        self, output_dir: str, changes: Dict[str, Any], settings: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        The manifest's record of the output files (see _record_outputs) if they
+        were written from the current inputs with the same settings, else None.
+        """
+        recorded = self._merge_manifest(output_dir).get("outputs")
+        if (
+            recorded is None
+            or recorded["inputs_hash"] != changes["inputs_hash"]
+            or recorded["settings"] != settings
+            or not os.path.exists(os.path.join(output_dir, "merged_properties.tsv"))
+        ):
+            return None
+        return recorded
+
+    def _record_outputs(self, output_dir: str, outputs: Dict[str, Any]) -> None:
+        """
+        Record in the merge manifest what the output files were written from. Called
+        after they are saved, so an interrupted run never looks up to date.
+        """
+        manifest = self._merge_manifest(output_dir)
+        manifest["outputs"] = outputs
+        self._write_merge_manifest(output_dir, manifest)
 
-        os.makedirs(output_dir, exist_ok=True)
+    def _iter_partition_chunks(
+        self, root: str, chunksize: int
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Yield the matching partitions of a dataset one record batch at a time, with
+        their descriptions (held as one page_link lookup per dataset).
+        """
+        descriptions = self._partition_descriptions(root)
+        for entry in PartitionedDataset(root).partitions(**self.partition_filters):
+            partition_dir = os.path.join(root, entry["path"])
+            for segment in SegmentStore(partition_dir).segments():
+                parquet_file = pq.ParquetFile(
+                    os.path.join(partition_dir, segment["file"])
+                )
+                for batch in parquet_file.iter_batches(batch_size=chunksize):
+                    df = batch.to_pandas()
+                    for key in ("contract_type", "property_type", "crawl_date"):
+                        if key not in df.columns:
+                            df[key] = entry[key]
+                    yield entry["source"], self._attach_descriptions(df, descriptions)
+
+    def stream_merge(self, output_path: str, chunksize: int = 100_000) -> Dict[str, Any]:
+        """
+        Out-of-core merge: every input is read in chunks of at most chunksize rows,
+        harmonized, tagged with its data_source and written straight to output_path
+        (Parquet row groups for .parquet, otherwise a TSV stream). Memory is bounded
+        by one chunk regardless of the dataset size. Columns follow the canonical
+        listing schema, in the same order as the in-memory merge with harmonize;
+        the validation, near-duplicate and outlier steps of run_pipeline, which
+        need the whole dataset, run only in memory. Call discover_data_files() first.
+
+        Returns the number of rows written and the peak RSS of the process.
+        """
+        schema = canonical_arrow_schema()
+        as_parquet = output_path.endswith(".parquet")
+        rows = 0
+
+        def chunks():
+            for file_path in self.tsv_files + self.xlsx_files:
+                print(f"Streaming {file_path}")
+                source = self._data_source(file_path)
+                for df in iter_data_file_chunks(file_path, chunksize):
+                    yield source, df
+            if self.use_partitions:
+                for root in self.partition_roots:
+                    print(f"Streaming partitions in {root}")
+                    yield from self._iter_partition_chunks(root, chunksize)
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with atomic_write(output_path) as tmp_path:
+            if as_parquet:
+                with pq.ParquetWriter(tmp_path, schema) as writer:
+                    for source, df in chunks():
+                        table = conform_to_schema(harmonize_listings(df, source), schema)
+                        writer.write_table(table)
+                        rows += table.num_rows
+            else:
+                with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                    f.write("\t".join(schema.names) + "\n")
+                    for source, df in chunks():
+                        table = conform_to_schema(harmonize_listings(df, source), schema)
+                        sanitize_text_columns(table.to_pandas()).to_csv(
+                            f, sep="\t", index=False, header=False
+                        )
+                        rows += table.num_rows
+
+        peak = peak_rss_mb()
+        print(f"Streamed {rows} rows to {output_path} (peak RSS {peak:.0f} MiB)")
+        return {"rows": rows, "output_path": output_path, "peak_rss_mb": peak}
+
+    def save_merged_data_to_files(
+        self, output_dir: str, merged_data: pd.DataFrame = None, xlsx: bool = True
+    ) -> Dict[str, str]:
+        """
+        Save merged data to TSV and XLSX files in the specified output folder.
+        The files are written from merged_data when it is given, so nothing is read again.
+        """
+        if merged_data is None:
+            merged_data = self.get_merged_data(discover=False)
 
         output_files = {}
+        if merged_data.empty:
+            print("No data files were saved as no data was found.")
+            return output_files
+
+        os.makedirs(output_dir, exist_ok=True)
 
         # Save merged TSV data
-        if not tsv_data.empty:
+        with self._phase("write_tsv"):
             tsv_output_path = os.path.join(output_dir, "merged_properties.tsv")
-            tsv_data.to_csv(tsv_output_path, sep="\t", index=False)
+            merged_data.to_csv(tsv_output_path, sep="\t", index=False)
             print(
-                f"Saved merged TSV data with {len(tsv_data)} rows to {tsv_output_path}"
+                f"Saved merged TSV data with {len(merged_data)} rows to {tsv_output_path}"
             )
             output_files["tsv"] = tsv_output_path
 
         # Save merged XLSX data
-        if not xlsx_data.empty:
-            xlsx_output_path = os.path.join(output_dir, "merged_properties.xlsx")
-            xlsx_data.to_excel(xlsx_output_path, index=False)
+        if xlsx and len(merged_data) >= EXCEL_MAX_ROWS:
             print(
-                f"Saved merged XLSX data with {len(xlsx_data)} rows to {xlsx_output_path}"
+                f"Skipping XLSX output: {len(merged_data)} rows exceed the Excel row limit"
             )
-            output_files["xlsx"] = xlsx_output_path
-
-        if not output_files:
-            print("No data files were saved as no data was found.")
+        elif xlsx:
+            with self._phase("write_xlsx"):
+                xlsx_output_path = os.path.join(output_dir, "merged_properties.xlsx")
+                merged_data.to_excel(xlsx_output_path, index=False)
+                print(
+                    f"Saved merged XLSX data with {len(merged_data)} rows to {xlsx_output_path}"
+                )
+                output_files["xlsx"] = xlsx_output_path
 
         return output_files
 
-    def run_pipeline(self, output_dir: str) -> Dict[str, Any]:
+    def run_pipeline(
+        self,
+        output_dir: str,
+        xlsx: bool = True,
+        incremental: bool = False,
+        streaming: bool = False,
+        near_duplicates: bool = False,
+        remove_outliers: bool = False,
+        validate: bool = False,
+    ) -> Dict[str, Any]:
         """
-        Run the complete data scraping pipeline:
-        1. Discover data files
-        2. Merge the data
-        3. Save to output files
+        Run the complete data scraping pipeline in a single pass:
+        1. Discover data files (once)
+        2. Load each file once and merge the data
+        3. Save the merged frame to output files
+        With incremental, only new or changed inputs are loaded (see
+        update_merged_parts), and when neither the inputs nor the harmonize,
+        validate, near_duplicates, remove_outliers and xlsx settings changed since
+        the last run, the parts are not even read and the output files are kept.
+        With streaming, the merge runs out of core (see stream_merge) and writes only
+        merged_properties.tsv, with the same columns as the in-memory merge; the
+        result also carries the peak RSS. The validate, near_duplicates and
+        remove_outliers steps need the whole frame and are not run when streaming.
+        With validate, listings breaking a validation rule (see pipeline.validation)
+        are moved to quarantined_properties.tsv and the result carries the number
+        of rows each rule rejected.
+        With near_duplicates, listings of the same property across sources share a
+        cluster_id column (see pipeline.near_duplicates).
+        With remove_outliers, listings outside the IQR fences or the censored tails
+        of their group are dropped (see pipeline.outliers).
+        The wall time of each phase is reported and returned under "timings".
         """
+        self.timings = {}
+        changes = None
+        validation = None
 
-        discovered_files = self.discover_data_files()
+        with self._phase("discovery"):
+            discovered_files = self.discover_data_files()
 
-        merged_data = self.get_merged_data()
+        if streaming:
+            with self._phase("stream_merge"):
+                streamed = self.stream_merge(
+                    os.path.join(output_dir, "merged_properties.tsv")
+                )
+            return {
+                "discovered_files": discovered_files,
+                "skipped_xlsx_files": self.skipped_xlsx_files,
+                "merged_row_count": streamed["rows"],
+                "output_files": {"tsv": streamed["output_path"]},
+                "peak_rss_mb": streamed["peak_rss_mb"],
+                "timings": dict(self.timings),
+            }
+
+        merged_data = None
+        recorded = None
+        if incremental:
+            changes = self.update_merged_parts(output_dir)
+            settings = {
+                "harmonize": self.harmonize,
+                "validate": validate,
+                "near_duplicates": near_duplicates,
+                "remove_outliers": remove_outliers,
+                "xlsx": xlsx,
+            }
+            recorded = self._recorded_outputs(output_dir, changes, settings)
+            if recorded is None:
+                merged_data = self.read_merged_parts(output_dir)
+        else:
+            merged_data = self.get_merged_data(discover=False)
+
+        if recorded is not None:
+            print("No input or setting changed, keeping the existing output files")
+            output_files = recorded["output_files"]
+            merged_row_count = recorded["rows"]
+            validation = recorded["validation"]
+        else:
+            if validate and not merged_data.empty:
+                with self._phase("validation"):
+                    merged_data, quarantined, validation = validate_listings(
+                        merged_data
+                    )
+                    os.makedirs(output_dir, exist_ok=True)
+                    quarantine_path = os.path.join(
+                        output_dir, "quarantined_properties.tsv"
+                    )
+                    with atomic_write(quarantine_path) as tmp_path:
+                        quarantined.to_csv(tmp_path, sep="\t", index=False)
+                print(
+                    f"Quarantined {validation['quarantined']} rows to "
+                    f"{quarantine_path}: {validation}"
+                )
+            if near_duplicates and not merged_data.empty:
+                with self._phase("near_duplicates"):
+                    merged_data["cluster_id"] = cluster_near_duplicates(merged_data)
+            if remove_outliers and not merged_data.empty:
+                with self._phase("outliers"):
+                    merged_data, outlier_stats = filter_outliers(merged_data)
+                print(f"Removed {outlier_stats['removed']} outliers: {outlier_stats}")
+            output_files = self.save_merged_data_to_files(
+                output_dir, merged_data=merged_data, xlsx=xlsx
+            )
+            merged_row_count = len(merged_data) if not merged_data.empty else 0
+            if incremental:
+                self._record_outputs(
+                    output_dir,
+                    {
+                        "inputs_hash": changes["inputs_hash"],
+                        "settings": settings,
+                        "output_files": output_files,
+                        "rows": merged_row_count,
+                        "validation": validation,
+                    },
+                )
 
-        output_files = self.save_merged_data_to_files(output_dir)
+        print("Time per phase:")
+        for phase, seconds in self.timings.items():
+            print(f"  {phase:16} {seconds:8.2f}s")
 
         return {
             "discovered_files": discovered_files,
-            "merged_row_count": len(merged_data) if not merged_data.empty else 0,
+            "skipped_xlsx_files": self.skipped_xlsx_files,
+            "merged_row_count": merged_row_count,
             "output_files": output_files,
+            "changes": changes,
+            "validation": validation,
+            "timings": dict(self.timings),
         }
 
 
 if __name__ == "__main__":
-    orchestrator = ScraperOrchestrator()
+    orchestrator = ScraperOrchestrator(workers=os.cpu_count() or 1)
     results = orchestrator.run_pipeline("pipeline/dataset/raw_final_output")
\ No newline at end of file
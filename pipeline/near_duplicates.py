@@ -0,0 +1,273 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Text compared between listings; descriptions are cut at MAX_TEXT_CHARS, since
+# their first sentences carry what identifies the property
+TEXT_COLUMNS = ("address", "description")
+MAX_TEXT_CHARS = 300
+
+# Candidates must agree on these columns exactly (a sale and a rental of the
+# same apartment are different listings)
+BLOCK_COLUMNS = ("contract_type",)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard similarity become candidates
+BANDS = 16
+# Buckets larger than this come from boilerplate text and are not compared
+MAX_BUCKET_SIZE = 50
+
+MIN_SIMILARITY = 0.5
+PRICE_TOLERANCE = 0.05
+SIZE_TOLERANCE = 0.05
+
+# Rows per chunk when computing signatures, to bound the shingle arrays
+_SIGNATURE_CHUNK = 20_000
+_MERSENNE_SEED = 1_000_003
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    """
+    Lowercase ASCII text with accents folded and punctuation collapsed to spaces.
+    Runs on Arrow compute kernels, several times faster than the pandas string
+    methods on millions of rows.
+    """
+    text = pa.array(series.astype("string").fillna(""), type=pa.large_string())
+    if isinstance(text, pa.ChunkedArray):
+        # Concatenated frames can hold thousands of tiny chunks, each a kernel call
+        text = text.combine_chunks()
+    text = pc.utf8_normalize(text, "NFKD")
+    text = pc.replace_substring_regex(text, r"\p{Mn}+", "")
+    text = pc.utf8_lower(text)
+    text = pc.replace_substring_regex(text, r"[^a-z0-9]+", " ")
+    text = pc.utf8_trim_whitespace(text)
+    return pd.Series(
+        text.to_numpy(zero_copy_only=False), index=series.index, dtype="string"
+    )
+
+
+def listing_text(
+    df: pd.DataFrame,
+    text_columns: Sequence[str] = TEXT_COLUMNS,
+    max_chars: int = MAX_TEXT_CHARS,
+) -> pd.Series:
+    """Normalized text of the text columns present in df, joined and truncated."""
+    text = pd.Series("", index=df.index, dtype="string")
+    for col in text_columns:
+        if col in df.columns:
+            text = text.str.cat(normalize_text(df[col]), sep=" ")
+    return text.str.strip().str.slice(0, max_chars)
+
+
+def minhash_signatures(
+    texts: pd.Series, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MinHash signatures of character shingles, computed with NumPy only: shingle
+    hashes come from a polynomial hash over the bytes of all texts at once, and
+    each permutation is a multiply-shift hash reduced to its minimum per row.
+    Returns the (rows, num_perm) uint32 signatures and a mask of the rows long
+    enough to have a shingle (the others have no signature).
+    """
+    rng = np.random.default_rng(_MERSENNE_SEED)
+    a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    powers = np.uint64(257) ** np.arange(shingle_size - 1, -1, -1, dtype=np.uint64)
+
+    lengths = texts.str.len().fillna(0).to_numpy(dtype=np.int64)
+    has_shingles = lengths >= shingle_size
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, np.uint32)
+
+    values = texts.fillna("").tolist()
+    for start in range(0, len(values), _SIGNATURE_CHUNK):
+        stop = min(start + _SIGNATURE_CHUNK, len(values))
+        chunk_lengths = lengths[start:stop]
+        rows = np.flatnonzero(has_shingles[start:stop])
+        if not len(rows):
+            continue
+
+        buffer = np.frombuffer(
+            "".join(values[start:stop]).encode("ascii"), dtype=np.uint8
+        ).astype(np.uint64)
+        offsets = np.concatenate(([0], np.cumsum(chunk_lengths)))
+        counts = chunk_lengths[rows] - shingle_size + 1
+
+        # Start of every shingle in the buffer, row by row
+        firsts = np.repeat(offsets[rows] - np.cumsum(counts) + counts, counts)
+        positions = firsts + np.arange(counts.sum())
+        shingles = np.zeros(len(positions), dtype=np.uint64)
+        for t in range(shingle_size):
+            shingles += buffer[positions + t] * powers[t]
+
+        row_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        for p in range(num_perm):
+            hashed = ((shingles * a[p] + b[p]) >> np.uint64(32)).astype(np.uint32)
+            signatures[start + rows, p] = np.minimum.reduceat(hashed, row_starts)
+
+    return signatures, has_shingles
+
+
+def _block_codes(df: pd.DataFrame, block_columns: Sequence[str]) -> np.ndarray:
+    """Hash of the blocking columns of each row (0 when there are none)."""
+    present = [col for col in block_columns if col in df.columns]
+    if not present:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(
+        df[present].astype("string"), index=False
+    ).to_numpy()
+
+
+def candidate_pairs(
+    signatures: np.ndarray,
+    rows: np.ndarray,
+    blocks: np.ndarray,
+    bands: int = BANDS,
+    max_bucket_size: int = MAX_BUCKET_SIZE,
+) -> np.ndarray:
+    """
+    LSH banding: rows sharing every signature value of some band (and the same
+    block) land in one bucket, and each bucket yields all of its pairs. Returns
+    the unique (left, right) row pairs, left < right, as an (m, 2) array.
+    """
+    band_width = signatures.shape[1] // bands
+    found = []
+    for band in range(bands):
+        columns = signatures[rows, band * band_width : (band + 1) * band_width]
+        keys = pd.util.hash_pandas_object(
+            pd.DataFrame(columns).assign(block=blocks[rows]), index=False
+        ).to_numpy()
+
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        _, inverse, sizes = np.unique(
+            sorted_keys, return_inverse=True, return_counts=True
+        )
+        keep = (sizes[inverse] > 1) & (sizes[inverse] <= max_bucket_size)
+        members, member_keys = rows[order[keep]], sorted_keys[keep]
+
+        # Members of a bucket are contiguous: pair each with the next d members
+        for d in range(1, min(max_bucket_size, len(members))):
+            same = member_keys[d:] == member_keys[:-d]
+            if not same.any():
+                break
+            found.append(np.column_stack((members[:-d][same], members[d:][same])))
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def _agrees(values: np.ndarray, pairs: np.ndarray, tolerance: float) -> pd.Series:
+    """Whether both sides of each pair are within tolerance; NA when one is missing."""
+    left, right = values[pairs[:, 0]], values[pairs[:, 1]]
+    scale = np.maximum(np.abs(left), np.abs(right))
+    agree = np.abs(left - right) <= tolerance * scale
+    return pd.Series(agree, dtype="boolean").mask(np.isnan(left) | np.isnan(right))
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+
+
+def find_near_duplicates(
+    df: pd.DataFrame,
+    text_columns: Sequence[str] = TEXT_COLUMNS,
+    block_columns: Sequence[str] = BLOCK_COLUMNS,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+    min_similarity: float = MIN_SIMILARITY,
+    price_tolerance: float = PRICE_TOLERANCE,
+    size_tolerance: float = SIZE_TOLERANCE,
+    cross_source_only: bool = False,
+) -> pd.DataFrame:
+    """
+    Pairs of listings describing the same property. Candidates come from MinHash
+    LSH over the normalized text, so the cost grows with the number of listings
+    rather than the number of pairs. Each candidate is scored on its estimated
+    text similarity and on price, size and bedroom agreement; it is a match when
+    the similarity reaches min_similarity, no attribute known on both sides
+    disagrees and at least one agrees.
+
+    Returns one row per match with the positions of both listings (left, right),
+    the similarity, the agreement flags and a score (similarity times the share
+    of known attributes that agree).
+    """
+    texts = listing_text(df, text_columns)
+    signatures, has_shingles = minhash_signatures(texts, num_perm=num_perm)
+    pairs = candidate_pairs(
+        signatures,
+        np.flatnonzero(has_shingles),
+        _block_codes(df, block_columns),
+        bands=bands,
+    )
+
+    if cross_source_only and "data_source" in df.columns and len(pairs):
+        sources = df["data_source"].astype("string").to_numpy()
+        pairs = pairs[sources[pairs[:, 0]] != sources[pairs[:, 1]]]
+
+    similarity = np.empty(len(pairs))
+    for start in range(0, len(pairs), _SIGNATURE_CHUNK):
+        chunk = pairs[start : start + _SIGNATURE_CHUNK]
+        similarity[start : start + len(chunk)] = (
+            signatures[chunk[:, 0]] == signatures[chunk[:, 1]]
+        ).mean(axis=1)
+
+    scored = pd.DataFrame(
+        {
+            "left": pairs[:, 0],
+            "right": pairs[:, 1],
+            "similarity": similarity,
+            "price_agrees": _agrees(_numeric(df, "price"), pairs, price_tolerance),
+            "size_agrees": _agrees(_numeric(df, "size_m2"), pairs, size_tolerance),
+            "bedrooms_agree": _agrees(_numeric(df, "bedrooms"), pairs, 0.0),
+        }
+    )
+    flags = scored[["price_agrees", "size_agrees", "bedrooms_agree"]]
+    known = flags.notna().sum(axis=1)
+    agreeing = flags.fillna(False).sum(axis=1)
+    scored["score"] = scored["similarity"] * (agreeing / known.where(known > 0))
+
+    matches = (
+        (scored["similarity"] >= min_similarity) & (agreeing == known) & (agreeing > 0)
+    )
+    return scored[matches].reset_index(drop=True)
+
+
+def connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Component of each of n nodes given the edges, by vectorized min-label
+    propagation with pointer jumping. Labels are dense, in order of first member.
+    """
+    labels = np.arange(n)
+    left, right = pairs[:, 0], pairs[:, 1]
+    while len(pairs):
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def cluster_near_duplicates(
+    df: pd.DataFrame, pairs: Optional[pd.DataFrame] = None, **kwargs
+) -> pd.Series:
+    """
+    Cluster ID of every listing: listings linked by near-duplicate matches (see
+    find_near_duplicates, which receives kwargs) share an ID, the others get
+    their own. Aligned with df's index.
+    """
+    if pairs is None:
+        pairs = find_near_duplicates(df, **kwargs)
+    labels = connected_components(len(df), pairs[["left", "right"]].to_numpy())
+    return pd.Series(labels, index=df.index, name="cluster_id")
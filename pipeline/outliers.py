@@ -0,0 +1,132 @@
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Listings are compared within their (property_type, region, contract_type)
+# group, the dimensions of the dashboard and of database.stats. Fields missing
+# from the frame are left out of the grouping.
+GROUP_FIELDS = ("property_type", "region", "contract_type")
+
+# Python counterparts of scripts/df-imoveis/functions/get_remove_outliers.R and
+# get_censorship.R, with the settings of the Shiny app
+IQR_COLUMNS = ("price", "size_m2")
+IQR_FACTOR = 1.5
+CENSOR_COLUMNS = ("price", "size_m2")
+CENSOR_PCT = 0.05
+
+
+def _group_codes(
+    df: pd.DataFrame, group_fields: Sequence[str]
+) -> Tuple[np.ndarray, int]:
+    """Group number of every row (missing group values form their own group)."""
+    present = [field for field in group_fields if field in df.columns]
+    if not present:
+        return np.zeros(len(df), dtype=np.int64), 1
+    codes = df.groupby(present, dropna=False, sort=False).ngroup().to_numpy()
+    return codes, int(codes.max()) + 1 if len(codes) else 0
+
+
+def _sort_within_groups(
+    values: np.ndarray, codes: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Positions of the non-missing values sorted by group, then value, then row
+    (ties keep row order), with the number of values and start of each group.
+    """
+    by_value = np.argsort(values, kind="stable")
+    by_value = by_value[~np.isnan(values[by_value])]
+    order = by_value[np.argsort(codes[by_value], kind="stable")]
+    counts = np.bincount(codes[order], minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return order, counts, starts
+
+
+def _group_quantiles(
+    sorted_values: np.ndarray,
+    counts: np.ndarray,
+    starts: np.ndarray,
+    quantiles: Sequence[float],
+) -> np.ndarray:
+    """
+    (n_groups, len(quantiles)) quantiles of each group's sorted values, with
+    linear interpolation like R's default and pandas' quantile.
+    """
+    result = np.full((len(counts), len(quantiles)), np.nan)
+    has_values = counts > 0
+    for j, q in enumerate(quantiles):
+        position = (counts[has_values] - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts[has_values] - 1)
+        base = starts[has_values]
+        low, high = sorted_values[base + lower], sorted_values[base + upper]
+        result[has_values, j] = low + (high - low) * (position - lower)
+    return result
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+
+
+def outlier_masks(
+    df: pd.DataFrame,
+    group_fields: Sequence[str] = GROUP_FIELDS,
+    iqr_columns: Sequence[str] = IQR_COLUMNS,
+    iqr_factor: float = IQR_FACTOR,
+    censor_columns: Sequence[str] = CENSOR_COLUMNS,
+    censor_pct: float = CENSOR_PCT,
+) -> pd.DataFrame:
+    """
+    Boolean masks, aligned with df, of the rows each rule rejects:
+    - iqr_<col>: outside [Q1 - factor * IQR, Q3 + factor * IQR] of its group;
+    - censored_<col>: among the floor(n * censor_pct) lowest or highest values
+      of its group, n being the group's non-missing values (ties are broken by
+      row order, like the R version's arrange and slice).
+    Rows missing a value are not rejected by that value's rules. Quantiles and
+    ranks come from the original data, computed once per column, whereas the R
+    version filters column after column.
+    """
+    codes, n_groups = _group_codes(df, group_fields)
+    masks = {}
+
+    # One sort per column serves both rules
+    for col in dict.fromkeys([*iqr_columns, *censor_columns]):
+        if col not in df.columns:
+            continue
+        values = _numeric(df, col)
+        order, counts, starts = _sort_within_groups(values, codes, n_groups)
+
+        if col in iqr_columns:
+            q1, q3 = _group_quantiles(values[order], counts, starts, (0.25, 0.75)).T
+            iqr = q3 - q1
+            lower = (q1 - iqr_factor * iqr)[codes]
+            upper = (q3 + iqr_factor * iqr)[codes]
+            masks[f"iqr_{col}"] = (values < lower) | (values > upper)
+
+        if col in censor_columns:
+            # Rank of each value within its group, 0-based
+            rank = np.full(len(df), -1, dtype=np.int64)
+            rank[order] = np.arange(len(order)) - starts[codes[order]]
+            n = counts[codes]
+            cut = np.floor(n * censor_pct).astype(np.int64)
+            masks[f"censored_{col}"] = (rank >= 0) & ((rank < cut) | (rank >= n - cut))
+
+    return pd.DataFrame(masks, index=df.index)
+
+
+def filter_outliers(
+    df: pd.DataFrame, masks_only: bool = False, **kwargs
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, Dict[str, int]]]:
+    """
+    Applies the IQR fences and the censorship per group (see outlier_masks, which
+    receives kwargs). With masks_only, returns the masks without touching or
+    copying the data. Otherwise returns the rows no rule rejects and the number
+    of rows each rule rejected (a row can be rejected by several rules).
+    """
+    masks = outlier_masks(df, **kwargs)
+    if masks_only:
+        return masks
+    rejected = masks.any(axis=1).to_numpy()
+    stats = {rule: int(mask.sum()) for rule, mask in masks.items()}
+    stats["removed"] = int(rejected.sum())
+    return df[~rejected], stats
@@ -0,0 +1,145 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from pipeline.near_duplicates import normalize_text
+
+# Administrative regions of the Distrito Federal, with the labels of
+# scripts/df-imoveis/functions/get_data_cleaned.R, and the spellings found in
+# listings (matched on accent-folded lowercase text, as whole words)
+REGIONS: Dict[str, List[str]] = {
+    "Brasilia": ["plano piloto", "asa sul", "asa norte", "noroeste"],
+    "Gama": ["gama"],
+    "Taguatinga": ["taguatinga"],
+    "Brazlandia": ["brazlandia"],
+    "Sobradinho": ["sobradinho"],
+    "Sobradinho II": ["sobradinho ii", "sobradinho 2"],
+    "Planaltina": ["planaltina"],
+    "Paranoa": ["paranoa"],
+    "Nucleo Bandeirante": ["nucleo bandeirante"],
+    "Ceilandia": ["ceilandia"],
+    "Guara": ["guara"],
+    "Cruzeiro": ["cruzeiro"],
+    "Samambaia": ["samambaia"],
+    "Santa Maria": ["santa maria"],
+    "Sao Sebastiao": ["sao sebastiao"],
+    "Recanto das Emas": ["recanto das emas"],
+    "Lago Sul": ["lago sul"],
+    "Lago Norte": ["lago norte"],
+    "Riacho Fundo": ["riacho fundo"],
+    "Riacho Fundo II": ["riacho fundo ii", "riacho fundo 2"],
+    "Candangolandia": ["candangolandia"],
+    "Aguas Claras": ["aguas claras"],
+    "Sudoeste Octogonal": ["sudoeste", "octogonal"],
+    "Varjão": ["varjao"],
+    "Park Way": ["park way"],
+    "SCIA": ["scia", "estrutural"],
+    "Jardim Botanico": ["jardim botanico"],
+    "Itapoã": ["itapoa"],
+    "SIA": ["sia"],
+    "Vicente Pires": ["vicente pires"],
+    "Fercal": ["fercal"],
+    "Sol Nascente": ["sol nascente", "por do sol"],
+    "Arniqueira": ["arniqueira", "arniqueiras"],
+    "Arapoanga": ["arapoanga"],
+    "Água Quente": ["agua quente"],
+}
+
+# Nearly every address ends in "Brasília - DF", so the city name only decides
+# the region when no other region is mentioned
+FALLBACK_REGION = "Brasilia"
+FALLBACK_PATTERNS = ["brasilia"]
+
+# Columns searched for a region, in order of precedence
+REGION_SOURCE_COLUMNS = ("address", "description")
+
+
+def trie_regex(words: Iterable[str]) -> str:
+    """
+    Regex of a trie of the words: each character is tested once per position
+    whatever the number of words, and a word that is a prefix of another is
+    an optional tail, so the longest word wins ("riacho fundo(?: ii)?").
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class RegionClassifier:
+    """
+    Tags listings with their administrative region. All spellings are compiled
+    into one trie-shaped regex run by Arrow's RE2 engine, an automaton that scans
+    each text once whatever the number of regions. The leftmost (longest) region
+    named in the address, or else in the description, wins; the fallback region
+    is used only when no other one is named.
+    """
+
+    def __init__(
+        self,
+        regions: Dict[str, List[str]] = REGIONS,
+        fallback: Optional[str] = FALLBACK_REGION,
+        fallback_patterns: List[str] = FALLBACK_PATTERNS,
+    ):
+        self.labels = {
+            pattern: label
+            for label, patterns in regions.items()
+            for pattern in patterns
+        }
+        self.pattern = rf"\b(?P<region>{trie_regex(self.labels)})\b"
+        self.fallback = fallback
+        self.fallback_pattern = rf"\b(?:{trie_regex(fallback_patterns)})\b"
+
+    def classify(
+        self, df: pd.DataFrame, columns: Iterable[str] = REGION_SOURCE_COLUMNS
+    ) -> pd.Series:
+        """Region of each row of df (None when none is named), aligned with df."""
+        region = pd.Series(None, index=df.index, dtype=object)
+        fallback = np.zeros(len(df), dtype=bool)
+        for col in columns:
+            if col not in df.columns:
+                continue
+            text = pa.array(normalize_text(df[col]), type=pa.large_string())
+            found = pc.struct_field(pc.extract_regex(text, self.pattern), [0])
+            labels = pd.Series(
+                found.to_numpy(zero_copy_only=False), index=df.index
+            ).map(self.labels)
+            region = region.where(region.notna(), labels)
+            matched = pc.match_substring_regex(text, self.fallback_pattern)
+            fallback |= matched.to_numpy(zero_copy_only=False)
+
+        if self.fallback is not None:
+            region = region.mask(region.isna() & fallback, self.fallback)
+        return region.where(region.notna(), None)
+
+
+_default_classifier: Optional[RegionClassifier] = None
+
+
+def classify_regions(
+    df: pd.DataFrame, columns: Iterable[str] = REGION_SOURCE_COLUMNS
+) -> pd.Series:
+    """Region of each row with the default classifier, compiled on first use."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = RegionClassifier()
+    return _default_classifier.classify(df, columns)
@@ -0,0 +1,182 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Bounding box of the Distrito Federal
+DF_LATITUDE = (-16.06, -15.49)
+DF_LONGITUDE = (-48.29, -47.30)
+
+# Plausible price per m², in R$, by contract type
+PRICE_M2_RANGES = {"venda": (500.0, 60_000.0), "aluguel": (3.0, 400.0)}
+SIZE_RANGE = (10.0, 20_000.0)
+MAX_BEDROOMS = 20
+MIN_M2_PER_BEDROOM = 6.0
+
+# Placeholders left in the text when the page was scraped before rendering
+TEMPLATE_MARKERS = ("{{", "}}")
+
+
+class Rule(NamedTuple):
+    """A validation rule: check returns the mask of the rows violating it."""
+
+    name: str
+    description: str
+    check: Callable[[pd.DataFrame], np.ndarray]
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Column as float64, all NaN when absent, so rules on it pass."""
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+
+
+def _outside(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Known values outside [low, high]; missing values pass."""
+    with np.errstate(invalid="ignore"):
+        return ~np.isnan(values) & ((values < low) | (values > high))
+
+
+def range_rule(name: str, column: str, low: float, high: float) -> Rule:
+    """Rows whose column is outside [low, high]."""
+    return Rule(
+        name,
+        f"{column} outside [{low:g}, {high:g}]",
+        lambda df: _outside(_numeric(df, column), low, high),
+    )
+
+
+def positive_rule(name: str, column: str) -> Rule:
+    """Rows whose column is zero or negative."""
+
+    def check(df: pd.DataFrame) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return _numeric(df, column) <= 0
+
+    return Rule(name, f"{column} not positive", check)
+
+
+def price_m2_rule(
+    name: str = "price_m2_range", ranges: Dict[str, Tuple[float, float]] = None
+) -> Rule:
+    """Rows whose price per m² is implausible for their contract type."""
+    ranges = PRICE_M2_RANGES if ranges is None else ranges
+
+    def check(df: pd.DataFrame) -> np.ndarray:
+        if "contract_type" not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_m2 = _numeric(df, "price") / _numeric(df, "size_m2")
+        price_m2[~np.isfinite(price_m2)] = np.nan
+        contract = df["contract_type"].astype("string").to_numpy(na_value="")
+        low = np.full(len(df), -np.inf)
+        high = np.full(len(df), np.inf)
+        for contract_type, (lower, upper) in ranges.items():
+            selected = contract == contract_type
+            low[selected], high[selected] = lower, upper
+        return _outside(price_m2, low, high)
+
+    bounds = ", ".join(f"{k} [{lo:g}, {hi:g}]" for k, (lo, hi) in ranges.items())
+    return Rule(name, f"price per m² outside {bounds}", check)
+
+
+def bedrooms_rule(
+    name: str = "bedrooms_vs_size",
+    max_bedrooms: int = MAX_BEDROOMS,
+    min_m2_per_bedroom: float = MIN_M2_PER_BEDROOM,
+) -> Rule:
+    """Rows with too many bedrooms overall or for their size."""
+
+    def check(df: pd.DataFrame) -> np.ndarray:
+        bedrooms, size = _numeric(df, "bedrooms"), _numeric(df, "size_m2")
+        with np.errstate(invalid="ignore"):
+            too_many = bedrooms > max_bedrooms
+            too_small = size < bedrooms * min_m2_per_bedroom
+        return too_many | too_small
+
+    return Rule(
+        name,
+        f"more than {max_bedrooms} bedrooms or under {min_m2_per_bedroom:g} m² each",
+        check,
+    )
+
+
+def coordinates_rule(
+    name: str = "coordinates_outside_df",
+    latitude: Tuple[float, float] = DF_LATITUDE,
+    longitude: Tuple[float, float] = DF_LONGITUDE,
+) -> Rule:
+    """Rows whose coordinates fall outside the bounding box."""
+    return Rule(
+        name,
+        "coordinates outside the Distrito Federal",
+        lambda df: _outside(_numeric(df, "latitude"), *latitude)
+        | _outside(_numeric(df, "longitude"), *longitude),
+    )
+
+
+def template_rule(
+    name: str = "unrendered_template", columns: Optional[Sequence[str]] = None
+) -> Rule:
+    """Rows with "{{ }}" placeholders in any text column (or in the given columns)."""
+
+    def check(df: pd.DataFrame) -> np.ndarray:
+        mask = np.zeros(len(df), dtype=bool)
+        for col in columns if columns is not None else df.columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if series.dtype == object or pd.api.types.is_string_dtype(series):
+                text = pa.array(series.astype("string"), type=pa.large_string())
+                found = pc.or_(
+                    *(pc.match_substring(text, marker) for marker in TEMPLATE_MARKERS)
+                )
+                mask |= pc.fill_null(found, False).to_numpy(zero_copy_only=False)
+        return mask
+
+    return Rule(name, "unrendered {{ }} template in the text", check)
+
+
+DEFAULT_RULES: List[Rule] = [
+    positive_rule("price_positive", "price"),
+    range_rule("size_range", "size_m2", *SIZE_RANGE),
+    price_m2_rule(),
+    bedrooms_rule(),
+    coordinates_rule(),
+    template_rule(),
+]
+
+
+def rule_masks(df: pd.DataFrame, rules: Sequence[Rule] = DEFAULT_RULES) -> pd.DataFrame:
+    """Violation mask of every rule, one boolean column per rule, aligned with df."""
+    return pd.DataFrame(
+        {rule.name: np.asarray(rule.check(df), dtype=bool) for rule in rules},
+        index=df.index,
+    )
+
+
+def validate_listings(
+    df: pd.DataFrame, rules: Sequence[Rule] = DEFAULT_RULES
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+    """
+    Evaluates every rule over the whole frame at once and splits it into the valid
+    rows and the quarantined ones, which get a failed_rules column listing the
+    rules they broke ("price_m2_range;size_range"). Returns both frames and the
+    number of rows each rule rejected, plus the valid and quarantined totals.
+    """
+    masks = rule_masks(df, rules)
+    rejected = masks.any(axis=1).to_numpy()
+
+    quarantined = df[rejected].copy()
+    failed = pd.Series("", index=quarantined.index, dtype=object)
+    for name in masks.columns:
+        failed = failed + np.where(masks[name].to_numpy()[rejected], f"{name};", "")
+    quarantined["failed_rules"] = failed.str.rstrip(";")
+
+    counts = {name: int(mask.sum()) for name, mask in masks.items()}
+    counts["valid"] = int(len(df) - rejected.sum())
+    counts["quarantined"] = int(rejected.sum())
+    return df[~rejected], quarantined, counts
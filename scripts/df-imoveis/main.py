@@ -15,6 +15,9 @@ HEADERS = {
 BASE_URL_ALUGUEL = "https://www.dfimoveis.com.br/aluguel/df/todos/{property_type}?pagina="
 BASE_URL_VENDA = "https://www.dfimoveis.com.br/venda/df/todos/{property_type}?pagina="
 
+# Dataset particionado (source / contract_type / property_type / crawl_date)
+PARTITIONS_DIR = "scripts/df-imoveis/dataset/partitions"
+
 
 def run_scraper(
     category="venda",
@@ -27,6 +30,8 @@ def run_scraper(
     batch_size=30,
     batch_delay=30,
     save_each_batch=True,
+    export_excel=True,
+    dataset_dir=PARTITIONS_DIR,
 ):
     """Executa o raspador do DF Imóveis com os parâmetros especificados."""
 
@@ -45,6 +50,7 @@ def run_scraper(
         property_type=property_type,
         output_dir=output_dir,
         append=append,
+        dataset_dir=dataset_dir,
     )
 
     data_handler = DataHandler(properties_data)
@@ -65,6 +71,17 @@ def run_scraper(
 
             print(f"Excel data saved to {excel_path}")
             print(f"TSV data saved to {tsv_path}")
+        elif save_each_batch:
+            # Os lotes já foram salvos nas partições; o Excel é gerado uma única vez
+            if export_excel:
+                data_handler.export_partitions_to_excel(
+                    dataset_dir,
+                    f"imoveis_df_{category}.xlsx",
+                    output_dir=output_dir,
+                    source="df-imoveis",
+                    contract_type=category,
+                    crawl_date="latest",
+                )
         else:
             excel_filename = f"imoveis_df_{category}.xlsx"
             tsv_filename = f"imoveis_df_{category}.tsv"
@@ -111,11 +128,24 @@ def run_all_scrapers(
                 batch_size=batch_size,
                 batch_delay=batch_delay,
                 save_each_batch=save_each_batch,
+                export_excel=False,
             )
             all_dataframes.append(df)
 
             time.sleep(30)
 
+        # Uma única exportação para Excel por tipo de contrato, a partir das partições
+        # da última raspagem de cada tipo de imóvel (não de todo o histórico)
+        if output_dir is not None and save_each_batch:
+            DataHandler([]).export_partitions_to_excel(
+                PARTITIONS_DIR,
+                f"imoveis_df_{contract_type}.xlsx",
+                output_dir=output_dir,
+                source="df-imoveis",
+                contract_type=contract_type,
+                crawl_date="latest",
+            )
+
     return all_dataframes
 
 
@@ -146,6 +176,7 @@ if __name__ == "__main__":
     clean_duplicates(
         input_dir="scripts/df-imoveis/dataset/raw_listings",
         output_dir="scripts/df-imoveis/dataset/raw_listings",
+        key="page_link",
     )
 
     categories = ["aluguel", "venda"]
@@ -1,6 +1,6 @@
 import re
 
-from scraping_utils import extract_numeric_value, get_link_or_none, get_text_or_none
+from scraping_utils import get_link_or_none, get_text_or_none
 
 
 class PropertyDataExtractor:
@@ -20,30 +20,23 @@ class PropertyDataExtractor:
 
         property_type = self.property_type
 
-        price_raw = get_text_or_none(property_soup, "div.new-price span")
-        price = self._extract_price(price_raw)
+        # Os números ficam como o texto raspado ("R$ 1.200.000", "120 m²",
+        # "2 a 3 quartos", "Sob Consulta"): são interpretados coluna a coluna na
+        # ingestão (pipeline.data_harmonization.parse_number_column), não aqui
+        price = get_text_or_none(property_soup, "div.new-price span")
 
         size_m2_element = property_soup.find("span", string=lambda x: x and "m²" in x)
-        size_m2_raw = size_m2_element.get_text(strip=True) if size_m2_element else None
-        size_m2 = extract_numeric_value(
-            size_m2_raw, allow_float=True, handle_range=True
-        )
+        size_m2 = size_m2_element.get_text(strip=True) if size_m2_element else None
 
         bedroom_element = property_soup.find(
             "span", string=lambda x: x and re.search(r"\b(quartos?|Quartos?)\b", x)
         )
-        bedroom_raw = bedroom_element.get_text(strip=True) if bedroom_element else None
-        bedroom = extract_numeric_value(
-            bedroom_raw, allow_float=False, handle_range=True
-        )
+        bedroom = bedroom_element.get_text(strip=True) if bedroom_element else None
 
         parking_element = property_soup.find(
             "span", string=lambda x: x and re.search(r"\b(vagas?|Vagas?)\b", x)
         )
-        parking_raw = parking_element.get_text(strip=True) if parking_element else None
-        parking = extract_numeric_value(
-            parking_raw, allow_float=False, handle_range=True
-        )
+        parking = parking_element.get_text(strip=True) if parking_element else None
 
         property_data = {
             "page_link": link,
@@ -56,17 +49,3 @@ class PropertyDataExtractor:
         }
 
         return property_data
-
-    def _extract_price(self, price_raw):
-        """Extrai valor numérico de preço do texto bruto."""
-
-        price = None
-        if price_raw:
-            if "Sob Consulta" in price_raw:
-                price = ""
-            else:
-                return extract_numeric_value(
-                    price_raw, allow_float=True, handle_range=False
-                )
-
-        return price
@@ -9,6 +9,8 @@ import requests
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 
+from scripts.utils.checkpoint import atomic_write
+
 # Define headers for requests to avoid being blocked
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:92.0) Gecko/20100101 Firefox/92.0"
@@ -137,17 +139,39 @@ def extract_property_descriptions(
         if "description" not in df.columns:
             df["description"] = ""
 
+        # Resume by page_link: listings whose description is already in the output
+        # file are not fetched again, wherever they sit in the new raw TSV. The output
+        # file is rewritten atomically after each batch, so it is its own checkpoint
+        link_column = "page_link" if "page_link" in df.columns else df.columns[0]
+        if os.path.exists(output_file_path):
+            saved_df = pd.read_csv(output_file_path, sep="\t")
+            if {link_column, "description"} <= set(saved_df.columns):
+                saved = saved_df.dropna(subset=["description"])
+                saved = saved[saved["description"].astype(str).str.strip() != ""]
+                saved_descriptions = saved.drop_duplicates(
+                    subset=link_column
+                ).set_index(link_column)["description"]
+                resumed = df[link_column].map(saved_descriptions)
+                df["description"] = resumed.where(resumed.notna(), df["description"])
+
+        has_description = df["description"].fillna("").astype(str).str.strip() != ""
+        pending = df.index[~has_description]
+        if has_description.any():
+            print(
+                f"Resuming: {int(has_description.sum())} descriptions already saved, "
+                f"{len(pending)} to fetch"
+            )
+
         success_count = 0
         failure_count = 0
 
-        num_batches = (
-            total_properties + batch_size - 1
-        ) // batch_size  # Ceiling division
+        num_batches = (len(pending) + batch_size - 1) // batch_size  # Ceiling division
 
         for batch_idx in range(num_batches):
             start_idx = batch_idx * batch_size
-            end_idx = min(start_idx + batch_size, total_properties)
-            batch_df = df.iloc[start_idx:end_idx].copy()
+            end_idx = min(start_idx + batch_size, len(pending))
+
+            batch_df = df.loc[pending[start_idx:end_idx]]
 
             print(
                 f"\nProcessing batch {batch_idx+1}/{num_batches} (properties {start_idx+1} to {end_idx})..."
@@ -156,7 +180,7 @@ def extract_property_descriptions(
             batch_results = []
             batch_indices = []
 
-            urls = [(i, row.iloc[0]) for i, row in batch_df.iterrows()]
+            urls = list(batch_df[link_column].items())
             # Shuffle order for more human-like behavior
             random.shuffle(urls)
 
@@ -238,11 +262,10 @@ def extract_property_descriptions(
                 df.at[idx, "description"] = description
 
             if save_each_batch:
-                temp_output_path = os.path.join(
-                    output_dir, f"imoveis_df_{category}.tsv"
-                )
-                df.to_csv(temp_output_path, sep="\t", index=False)
-                print(f"Saved interim results to {temp_output_path}")
+                # Temp file + atomic rename: a crash never leaves a half-written file
+                with atomic_write(output_file_path) as tmp_path:
+                    df.to_csv(tmp_path, sep="\t", index=False)
+                print(f"Saved interim results to {output_file_path}")
 
             if batch_idx < num_batches - 1:
                 batch_delay = random.lognormvariate(
@@ -254,7 +277,8 @@ def extract_property_descriptions(
                 time.sleep(batch_delay)
 
         # Save the final updated dataframe to the output file
-        df.to_csv(output_file_path, sep="\t", index=False)
+        with atomic_write(output_file_path) as tmp_path:
+            df.to_csv(tmp_path, sep="\t", index=False)
 
         print("\n=============================================")
         print(f"Processing complete!")
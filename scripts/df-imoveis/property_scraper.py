@@ -1,12 +1,15 @@
 import concurrent.futures
+import os
 import random
 import time
+from datetime import date
 
 import requests
 from bs4 import BeautifulSoup
 from property_data_extractor import PropertyDataExtractor
 
 from scripts.utils.data_handler import DataHandler
+from scripts.utils.partitioned_dataset import PartitionedDataset
 
 
 class PropertyScraper:
@@ -112,6 +115,7 @@ class PropertyScraper:
         property_type="imoveis",
         output_dir=None,
         append=True,
+        dataset_dir=None,
     ):
         """# Raspa todas as páginas até que não haja mais dados disponíveis ou max_pages seja atingido."""
 
@@ -120,6 +124,45 @@ class PropertyScraper:
         page = 1
         current_batch = 1
         consecutive_empty_pages_threshold = 2
+        end_of_results = False
+        tsv_filename = f"imoveis_df_{category}.tsv"
+        batch_prefix = f"df-imoveis-{category}-{property_type}-"
+        checkpoint = DataHandler([]).get_checkpoint(output_dir)
+
+        # Partição Hive do lote: source / contract_type / property_type / crawl_date
+        if dataset_dir is None and output_dir:
+            dataset_dir = os.path.join(
+                os.path.dirname(os.path.normpath(output_dir)), "partitions"
+            )
+        checkpointing = bool(save_each_batch and output_dir)
+
+        if checkpointing and not append:
+            # Recomeça do zero: descarta partições, checkpoints e o TSV anteriores
+            DataHandler([]).drop_partitions(
+                dataset_dir,
+                source="df-imoveis",
+                contract_type=category,
+                property_type=property_type,
+            )
+            tsv_path = os.path.join(output_dir, tsv_filename)
+            if os.path.exists(tsv_path):
+                os.remove(tsv_path)
+            checkpoint.reset(batch_prefix, files=[tsv_path])
+
+        # Execução da raspagem: retoma a que foi interrompida ou inicia uma nova.
+        # O ID da execução entra nos IDs de lote, então lotes de raspagens já
+        # concluídas nunca são reaproveitados
+        if checkpointing:
+            run = checkpoint.start_run(batch_prefix)
+        else:
+            run = {"run_id": f"{date.today():%Y%m%d}", "crawl_date": date.today()}
+        run_prefix = f"{batch_prefix}{run['run_id']}-"
+        partition = {
+            "source": "df-imoveis",
+            "contract_type": category,
+            "property_type": property_type,
+            "crawl_date": run["crawl_date"],
+        }
 
         total_batches = None
         if max_pages:
@@ -131,6 +174,25 @@ class PropertyScraper:
         while True:
             batch_properties = []
             batch_start_page = page
+            batch_id = f"{run_prefix}p{page}-{page + batch_size - 1}"
+
+            # Retomada: lotes já confirmados são lidos das partições em vez de raspados
+            if checkpointing and checkpoint.is_committed(batch_id):
+                committed_df = PartitionedDataset(dataset_dir).read_batch(
+                    batch_id,
+                    source="df-imoveis",
+                    contract_type=category,
+                    property_type=property_type,
+                )
+                if committed_df is not None:
+                    all_properties.extend(committed_df.to_dict("records"))
+                print(f"Lote {batch_id} já salvo anteriormente, pulando...")
+                page += batch_size
+                current_batch += 1
+                if max_pages and page > max_pages:
+                    break
+                continue
+
             print(
                 f"\n--- Starting batch {current_batch} (pages {batch_start_page} to {batch_start_page + batch_size - 1}) ---"
             )
@@ -159,14 +221,15 @@ class PropertyScraper:
                             print(
                                 f"Encontradas {consecutive_empty_pages_threshold} páginas vazias consecutivas. Assumindo fim dos resultados."
                             )
-                            return all_properties
+                            end_of_results = True
+                            break
                     elif status_code != 200:
                         print(f"Erro ao acessar página. Status code: {status_code}")
                     else:
                         empty_page_count = 0
                         batch_properties.extend(properties)
 
-                while batch_page_count < batch_size:
+                while not end_of_results and batch_page_count < batch_size:
                     if max_pages and page > max_pages:
                         break
 
@@ -183,7 +246,8 @@ class PropertyScraper:
                             print(
                                 f"Encontradas {consecutive_empty_pages_threshold} páginas vazias consecutivas. Assumindo fim dos resultados."
                             )
-                            return all_properties
+                            end_of_results = True
+                            break
                     elif status_code != 200:
                         print(f"Erro ao acessar página. Status code: {status_code}")
                     else:
@@ -199,29 +263,32 @@ class PropertyScraper:
             print(f"Properties found: {batch_property_count}")
             print(f"Total properties so far: {len(all_properties)}")
 
-            if max_pages and page > max_pages:
-                print(f"Atingido o número máximo de páginas: {max_pages}")
-                break
-
             if save_each_batch and batch_properties and output_dir:
                 print(f"Saving data from batch {current_batch}...")
                 batch_data_handler = DataHandler(batch_properties)
                 batch_df = batch_data_handler.create_dataframe(category)
 
-                excel_filename = f"imoveis_df_{category}.xlsx"
-                tsv_filename = f"imoveis_df_{category}.tsv"
-
-                batch_data_handler.save_to_excel(
-                    batch_df, excel_filename, output_dir=output_dir, append=append
-                )
-                batch_data_handler.save_to_tsv(
-                    batch_df, tsv_filename, output_dir=output_dir, append=append
+                # Segmento Parquet na partição + TSV, confirmados no checkpoint do lote
+                batch_data_handler.save_batch(
+                    batch_df,
+                    batch_id,
+                    dataset_dir,
+                    partition,
+                    tsv_filename,
+                    output_dir=output_dir,
                 )
 
                 print(
-                    f"Batch {current_batch} data for {property_type} saved to {output_dir}/{excel_filename} and {output_dir}/{tsv_filename}"
+                    f"Batch {current_batch} data for {property_type} saved to {dataset_dir} and {output_dir}/{tsv_filename}"
                 )
 
+            if end_of_results:
+                break
+
+            if max_pages and page > max_pages:
+                print(f"Atingido o número máximo de páginas: {max_pages}")
+                break
+
             actual_delay = batch_delay + random.uniform(
                 -5, 5
             )  # Adiciona alguma aleatoriedade
@@ -229,6 +296,10 @@ class PropertyScraper:
             time.sleep(actual_delay)
             current_batch += 1
 
+        if checkpointing:
+            # Raspagem completa: a próxima começa uma nova execução
+            checkpoint.finish_run(batch_prefix)
+
         print(
             f"\nRaspagem concluída. Total de propriedades coletadas: {len(all_properties)}"
         )
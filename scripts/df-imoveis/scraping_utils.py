@@ -1,6 +1,3 @@
-import re
-
-
 def get_text_or_none(element, selector):
     """Extrai texto de um elemento usando um seletor CSS."""
 
@@ -24,36 +21,6 @@ def get_link_or_none(element, selector):
     return None
 
 
-def extract_numeric_value(text, allow_float=True, handle_range=True):
-    """Extrai valor numérico do texto."""
-    if not text:
-        return None
-
-    # Trata intervalos como "2 a 3" pegando o primeiro valor
-    if handle_range and "a" in text:
-        text = text.split("a")[0].strip()
-
-    # Extrai a parte numérica
-    pattern = r"(\d+(?:[.,]\d+)?)" if allow_float else r"(\d+)"
-    numeric_match = re.search(pattern, text)
-
-    if numeric_match:
-        value = numeric_match.group(1)
-        if allow_float:
-            # Substitui vírgula por ponto para valores decimais
-            value = value.replace(".", "").replace(",", ".")
-            try:
-                return float(value)
-            except:
-                return text
-        else:
-            try:
-                return int(value)
-            except:
-                return text
-    return text if text else None
-
-
 PROPERTY_TYPES = [
     "apartamento",
     "casa",
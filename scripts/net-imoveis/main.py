@@ -1,12 +1,18 @@
 import concurrent.futures
+import os
 import threading
 import time
+from datetime import date
 
 import pandas as pd
 from bs4 import BeautifulSoup as bs
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from utils.data_handler import DataHandler
+from utils.partitioned_dataset import PartitionedDataset
+
+# Dataset particionado (source / contract_type / property_type / crawl_date)
+PARTITIONS_DIR = "scripts/net-imoveis/dataset/partitions"
 
 
 def scrape_page(driver, url, tipo_transacao, page_number, property_type=None):
@@ -155,6 +161,7 @@ def scrape_netimoveis(
     append=False,
     custom_output_files=None,
     property_type=None,
+    dataset_dir=PARTITIONS_DIR,
 ):
     """
     Raspa dados de imóveis de múltiplas páginas usando threads paralelas.
@@ -188,8 +195,41 @@ def scrape_netimoveis(
         driver = get_driver()
         return scrape_page(driver, url, tipo_transacao, page_number, property_type)
 
+    def file_prefix_for_output():
+        """Prefixo dos arquivos de saída a partir do tipo de transação e do imóvel."""
+        if property_type:
+            return f"imoveis_netimoveis_{tipo_transacao.lower()}_{property_type}"
+        return f"imoveis_netimoveis_{tipo_transacao.lower()}"
+
+    # Partição Hive dos lotes: source / contract_type / property_type / crawl_date
+    partition = {
+        "source": "net-imoveis",
+        "contract_type": tipo_transacao.lower(),
+        "property_type": property_type or "todos",
+        "crawl_date": date.today(),
+    }
+    partition_filters = {
+        key: partition[key] for key in ("source", "contract_type", "property_type")
+    }
+
+    def batch_output_paths():
+        """Caminho e separador do arquivo de texto que recebe cada lote."""
+        if (
+            custom_output_files
+            and "excel_path" in custom_output_files
+            and "tsv_path" in custom_output_files
+        ):
+            # Usar caminhos personalizados (orquestrador)
+            return custom_output_files["tsv_path"], "\t"
+        return os.path.join(output_dir, f"{file_prefix_for_output()}.csv"), ","
+
+    def batch_checkpoint():
+        """Checkpoint dos lotes já confirmados no diretório de saída."""
+        text_path = batch_output_paths()[0]
+        return DataHandler([]).get_checkpoint(os.path.dirname(text_path))
+
     # Função para salvar os dados após cada lote
-    def save_batch_data(batch_properties):
+    def save_batch_data(batch_properties, batch_id):
         if not batch_properties or output_dir is None:
             return None
 
@@ -199,52 +239,37 @@ def scrape_netimoveis(
         # Criar DataFrame com a coluna 'contract_type'
         batch_df = data_handler.create_dataframe(tipo_transacao.lower())
 
-        # Verificar se há arquivos personalizados definidos
+        # Segmento Parquet na partição + arquivo de texto, confirmados no checkpoint
+        # do lote; o Excel é exportado uma única vez no final
+        text_path, separator = batch_output_paths()
+        data_handler.save_batch(
+            batch_df, batch_id, dataset_dir, partition, text_path, separator=separator
+        )
+
+        print(f"Batch data saved to {dataset_dir} and {text_path}")
+
+        return batch_df
+
+    def export_excel():
+        """Gera o Excel final a partir das partições salvas nos lotes desta raspagem."""
+        data_handler = DataHandler([])
+        filters = dict(partition_filters, crawl_date=partition["crawl_date"])
         if (
             custom_output_files
             and "excel_path" in custom_output_files
             and "tsv_path" in custom_output_files
         ):
-            # Usar caminhos personalizados (orquestrador)
-            excel_path = custom_output_files["excel_path"]
-            tsv_path = custom_output_files["tsv_path"]
-
-            # Salvar diretamente nos caminhos personalizados
-            data_handler.save_to_excel(
-                batch_df, excel_path, append=True
-            )  # Sempre append=True para lotes
-            data_handler.save_to_tsv(
-                batch_df, tsv_path, append=True
-            )  # Sempre append=True para lotes
-
-            print(f"Batch data saved to {excel_path} and {tsv_path}")
+            data_handler.export_partitions_to_excel(
+                dataset_dir, custom_output_files["excel_path"], **filters
+            )
         else:
-            # Usar o transaction type e property_type para o prefixo de arquivo
-            if property_type:
-                file_prefix = (
-                    f"imoveis_netimoveis_{tipo_transacao.lower()}_{property_type}"
-                )
-            else:
-                file_prefix = f"imoveis_netimoveis_{tipo_transacao.lower()}"
-
-            # Salvar em Excel
-            excel_filename = f"{file_prefix}.xlsx"
-            data_handler.save_to_excel(
-                batch_df, excel_filename, output_dir=output_dir, append=True
-            )  # Sempre append=True para lotes
-
-            # Salvar em CSV
-            csv_filename = f"{file_prefix}.csv"
-            data_handler.save_to_csv(
-                batch_df, csv_filename, output_dir=output_dir, append=True
-            )  # Sempre append=True para lotes
-
-            print(
-                f"Batch data saved to {output_dir}/{excel_filename} and {output_dir}/{csv_filename}"
+            data_handler.export_partitions_to_excel(
+                dataset_dir,
+                f"{file_prefix_for_output()}.xlsx",
+                output_dir=output_dir,
+                **filters,
             )
 
-        return batch_df
-
     all_properties = []
     page = 1
     continue_scraping = True
@@ -255,6 +280,9 @@ def scrape_netimoveis(
     # Inicializar o DataFrame final
     final_df = None
 
+    # Prefixo dos IDs de lote registrados no checkpoint
+    batch_prefix = f"netimoveis-{tipo_transacao.lower()}-{property_type or 'todos'}-"
+
     # Se append=False, limpar os arquivos existentes antes de começar
     if output_dir is not None and not append:
         # Criar um DataHandler vazio apenas para limpar os arquivos
@@ -275,12 +303,7 @@ def scrape_netimoveis(
             )
         else:
             # Limpar arquivos padrão
-            if property_type:
-                file_prefix = (
-                    f"imoveis_netimoveis_{tipo_transacao.lower()}_{property_type}"
-                )
-            else:
-                file_prefix = f"imoveis_netimoveis_{tipo_transacao.lower()}"
+            file_prefix = file_prefix_for_output()
 
             excel_filename = f"{file_prefix}.xlsx"
             csv_filename = f"{file_prefix}.csv"
@@ -292,11 +315,43 @@ def scrape_netimoveis(
                 empty_df, csv_filename, output_dir=output_dir, append=False
             )
 
+        # As partições e os lotes confirmados anteriormente deixam de valer
+        empty_handler.drop_partitions(dataset_dir, **partition_filters)
+        batch_checkpoint().reset(batch_prefix, files=[batch_output_paths()[0]])
+
+    # Execução da raspagem: retoma a que foi interrompida ou inicia uma nova. O ID
+    # da execução entra nos IDs de lote, então lotes de raspagens já concluídas
+    # nunca são reaproveitados
+    if output_dir is not None:
+        run = batch_checkpoint().start_run(batch_prefix)
+        partition["crawl_date"] = run["crawl_date"]
+        run_prefix = f"{batch_prefix}{run['run_id']}-"
+    else:
+        run_prefix = f"{batch_prefix}{date.today():%Y%m%d}-"
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
         while continue_scraping and page <= total_pages:
             futures = []
             current_batch_start = page
             batch_properties = []
+            batch_end = min(page + actual_batch_size - 1, total_pages)
+            batch_id = f"{run_prefix}p{page}-{batch_end}"
+
+            # Retomada: lotes já confirmados são lidos das partições, sem nova raspagem
+            if output_dir is not None and batch_checkpoint().is_committed(batch_id):
+                committed_df = PartitionedDataset(dataset_dir).read_batch(
+                    batch_id, **partition_filters
+                )
+                if committed_df is not None:
+                    all_properties.extend(committed_df.to_dict("records"))
+                    final_df = (
+                        committed_df
+                        if final_df is None
+                        else pd.concat([final_df, committed_df], ignore_index=True)
+                    )
+                print(f"Lote {batch_id} já salvo anteriormente, pulando...")
+                page = batch_end + 1
+                continue
 
             # Submit batch of pages to the executor
             for i in range(min(actual_batch_size, total_pages - page + 1)):
@@ -323,7 +378,7 @@ def scrape_netimoveis(
                 print(
                     f"Salvando dados do lote: páginas {current_batch_start}-{current_batch_end}..."
                 )
-                batch_df = save_batch_data(batch_properties)
+                batch_df = save_batch_data(batch_properties, batch_id)
 
                 # Atualizar o DataFrame final
                 if final_df is None:
@@ -347,6 +402,14 @@ def scrape_netimoveis(
         if hasattr(thread_local, "driver"):
             thread_local.driver.quit()
 
+    # Raspagem completa: a próxima começa uma nova execução
+    if output_dir is not None:
+        batch_checkpoint().finish_run(batch_prefix)
+
+    # Exportar o Excel uma única vez, a partir dos segmentos de todos os lotes
+    if output_dir is not None and final_df is not None:
+        export_excel()
+
     # Se não temos um DataFrame final ainda, criar um a partir de all_properties
     if final_df is None and all_properties:
         data_handler = DataHandler(all_properties)
@@ -366,6 +429,7 @@ def run_scraper(
     output_dir=None,
     append=False,
     custom_output_files=None,
+    dataset_dir=PARTITIONS_DIR,
 ):
     """
     Run the Net Imoveis scraper with the specified parameters.
@@ -440,6 +504,7 @@ def run_scraper(
             append=append,
             custom_output_files=custom_output_files,
             property_type=property_type,
+            dataset_dir=dataset_dir,
         )
 
         return df
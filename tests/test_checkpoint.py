@@ -0,0 +1,80 @@
+from utils.checkpoint import BatchCheckpoint
+
+PREFIX = "df-imoveis-venda-casas-"
+
+
+def _batch_id(run, pages):
+    return f"{PREFIX}{run['run_id']}-{pages}"
+
+
+def test_interrupted_run_is_resumed(tmp_path):
+    manifest_path = tmp_path / "_checkpoint.json"
+    checkpoint = BatchCheckpoint(manifest_path)
+    run = checkpoint.start_run(PREFIX)
+    checkpoint.commit(_batch_id(run, "p1-10"), rows=10)
+
+    # Crash: a new process reloads the manifest and resumes the same run
+    resumed = BatchCheckpoint(manifest_path)
+    assert resumed.start_run(PREFIX) == run
+    assert resumed.is_committed(_batch_id(run, "p1-10"))
+    assert not resumed.is_committed(_batch_id(run, "p11-20"))
+
+
+def test_finished_run_is_not_replayed(tmp_path):
+    manifest_path = tmp_path / "_checkpoint.json"
+    checkpoint = BatchCheckpoint(manifest_path)
+    run = checkpoint.start_run(PREFIX)
+    checkpoint.commit(_batch_id(run, "p1-10"), rows=10)
+    checkpoint.finish_run(PREFIX)
+
+    next_crawl = BatchCheckpoint(manifest_path)
+    next_run = next_crawl.start_run(PREFIX)
+    assert "finished_at" not in next_run
+    assert next_run["started_at"] != run["started_at"]
+    assert next_crawl.committed_batches(PREFIX) == []
+
+
+def test_finish_run_keeps_batches_committed_by_other_instances(tmp_path):
+    manifest_path = tmp_path / "_checkpoint.json"
+    crawl = BatchCheckpoint(manifest_path)
+    crawl.start_run(PREFIX)
+    other = "net-imoveis-aluguel-20250224T093000-p1-10"
+    BatchCheckpoint(manifest_path).commit(other, rows=5)
+
+    crawl.finish_run(PREFIX)
+    assert BatchCheckpoint(manifest_path).is_committed(other)
+
+
+def test_runs_are_tracked_per_prefix(tmp_path):
+    checkpoint = BatchCheckpoint(tmp_path / "_checkpoint.json")
+    run = checkpoint.start_run(PREFIX)
+    checkpoint.start_run("df-imoveis-aluguel-casas-")
+    checkpoint.finish_run("df-imoveis-aluguel-casas-")
+
+    assert checkpoint.start_run(PREFIX) == run
+
+
+def test_reset_forgets_runs_batches_and_files(tmp_path):
+    manifest_path = tmp_path / "_checkpoint.json"
+    tsv_path = tmp_path / "imoveis_df_venda.tsv"
+    tsv_path.write_text("page_link\na\n")
+    checkpoint = BatchCheckpoint(manifest_path)
+    run = checkpoint.start_run(PREFIX)
+    checkpoint.commit(_batch_id(run, "p1-10"), rows=1, files=[tsv_path])
+
+    checkpoint.reset(PREFIX, files=[tsv_path])
+    reloaded = BatchCheckpoint(manifest_path)
+    assert reloaded.manifest == {"batches": {}, "files": {}, "runs": {}}
+
+
+def test_repair_truncates_uncommitted_tail(tmp_path):
+    checkpoint = BatchCheckpoint(tmp_path / "_checkpoint.json")
+    tsv_path = tmp_path / "imoveis_df_venda.tsv"
+    tsv_path.write_text("page_link\na\n")
+    checkpoint.repair(tsv_path)
+    checkpoint.commit("batch-1", rows=1, files=[tsv_path])
+
+    with open(tsv_path, "a") as f:
+        f.write("b\n")
+    checkpoint.repair(tsv_path)
+    assert tsv_path.read_text() == "page_link\na\n"
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from utils.checkpoint import BatchCheckpoint
+from utils.data_cleaner import ADDRESS_KEY, clean_duplicates, dedupe_file
+from utils.data_handler import CHECKPOINT_FILENAME
+
+ROWS = [
+    ("a", "SQN 308", "500000", "90"),
+    ("b", "SQS 102", "750000", "120"),
+    ("A ", "sqn  308", "500000", "90"),
+    ("c", "SQN 308 ", "500000", "90"),
+]
+
+
+def _write_tsv(path, rows=ROWS):
+    lines = ["page_link\taddress\tprice\tsize"] + ["\t".join(row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _read(path):
+    return pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+
+
+@pytest.mark.parametrize("memory_budget_mb", [512, 0.0001])
+def test_dedupe_file_modes_agree(tmp_path, memory_budget_mb):
+    source = tmp_path / "imoveis_df_venda.tsv"
+    _write_tsv(source)
+    output = tmp_path / "out.tsv"
+
+    result = dedupe_file(source, output, memory_budget_mb=memory_budget_mb, chunksize=2)
+
+    assert result["mode"] == ("memory" if memory_budget_mb == 512 else "external")
+    assert (result["rows"], result["removed"]) == (4, 1)
+    # Values are written back unchanged, in their original order
+    assert _read(output)["page_link"].tolist() == ["a", "b", "c"]
+
+
+def test_dedupe_file_by_address_key(tmp_path):
+    source = tmp_path / "imoveis_df_venda.tsv"
+    _write_tsv(source)
+
+    result = dedupe_file(source, source, key=list(ADDRESS_KEY))
+
+    assert result["removed"] == 2
+    assert _read(source)["page_link"].tolist() == ["a", "b"]
+
+
+def test_dedupe_file_reports_missing_key(tmp_path):
+    source = tmp_path / "imoveis_df_venda.tsv"
+    _write_tsv(source)
+    assert "error" in dedupe_file(source, source, key="url")
+
+
+def test_clean_duplicates_in_place_refreshes_checkpoint_sizes(tmp_path):
+    source = tmp_path / "imoveis_df_venda.tsv"
+    _write_tsv(source)
+    checkpoint = BatchCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    checkpoint.commit("batch-1", rows=len(ROWS), files=[source])
+
+    results = clean_duplicates(tmp_path, tmp_path, workers=1)
+
+    assert results[0]["removed"] == 1
+    reloaded = BatchCheckpoint(tmp_path / CHECKPOINT_FILENAME)
+    assert reloaded.manifest["files"][str(source)] == source.stat().st_size
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.data_cleaning import DataCleaner, row_fingerprints
+
+
+def test_fingerprints_ignore_column_order_and_null_kind():
+    left = pd.DataFrame({"a": [1, None], "b": ["x", "y"]})
+    right = pd.DataFrame({"b": ["x", "y"], "a": [1, np.nan]})
+    assert row_fingerprints(left).tolist() == row_fingerprints(right).tolist()
+
+
+def test_fingerprints_of_unhashable_values():
+    df = pd.DataFrame({"amenities": [["pool", "gym"], ["pool", "gym"], {"a": 1}]})
+    fingerprints = row_fingerprints(df)
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[0] != fingerprints[2]
+
+
+def test_remove_duplicates_keeps_records_in_input_form():
+    records = [
+        {"page_link": "a", "price": 1},
+        {"price": 1, "page_link": "a"},
+        {"page_link": "b", "price": 2},
+    ]
+    cleaner = DataCleaner(records)
+    removed = cleaner.remove_duplicates()
+
+    assert removed == {"duplicates": 1, "null_keys": 0}
+    assert cleaner.data == [records[0], records[2]]
+
+
+@pytest.mark.parametrize(
+    "keep, expected", [("first", [0, 2]), ("last", [1, 2]), (False, [2])]
+)
+def test_remove_duplicates_keep(keep, expected):
+    df = pd.DataFrame({"page_link": ["a", "a", "b"], "price": [1, 2, 3]})
+    cleaner = DataCleaner(df)
+    cleaner.remove_duplicates(subset=["page_link"], keep=keep)
+    assert cleaner.data["price"].tolist() == [df["price"][i] for i in expected]
+
+
+@pytest.mark.parametrize(
+    "nulls, rows, removed",
+    [
+        ("equal", 2, {"duplicates": 1, "null_keys": 0}),
+        ("distinct", 3, {"duplicates": 0, "null_keys": 0}),
+        ("drop", 1, {"duplicates": 0, "null_keys": 2}),
+    ],
+)
+def test_remove_duplicates_null_policies(nulls, rows, removed):
+    df = pd.DataFrame({"page_link": [None, None, "a"], "price": [1, 2, 3]})
+    cleaner = DataCleaner(df)
+    assert cleaner.remove_duplicates(subset=["page_link"], nulls=nulls) == removed
+    assert len(cleaner.data) == rows
+
+
+def test_remove_duplicates_rejects_unknown_policy_and_columns():
+    cleaner = DataCleaner(pd.DataFrame({"page_link": ["a"]}))
+    with pytest.raises(ValueError):
+        cleaner.remove_duplicates(nulls="ignore")
+    with pytest.raises(KeyError):
+        cleaner.remove_duplicates(subset=["price"])
+
+
+def test_remove_empty_values_keeps_zeros():
+    df = pd.DataFrame({"price": [0, None, 5], "address": ["SQN 308", "x", "  "]})
+    cleaner = DataCleaner(df)
+    assert cleaner.remove_empty_values() == 2
+    assert cleaner.data["price"].tolist() == [0]
@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from pipeline.data_harmonization import harmonize_listings, parse_number_column
+from pipeline.data_scraping import iter_data_file_chunks, read_data_file
+
+
+def test_parse_number_column_values_and_statuses():
+    raw = pd.Series(
+        [
+            "R$ 1.200.000",
+            "Sob Consulta",
+            "2 a 3 Quartos",
+            "",
+            None,
+            "abc",
+            "1,5 mi",
+            "120 m²",
+            "1200.0",
+        ],
+        dtype=object,
+    )
+    parsed = parse_number_column(raw)
+
+    assert parsed["status"].tolist() == [
+        "parsed",
+        "on_request",
+        "range",
+        "missing",
+        "missing",
+        "invalid",
+        "parsed",
+        "parsed",
+        "parsed",
+    ]
+    values = parsed["value"].tolist()
+    assert values[0] == 1_200_000
+    assert values[2] == 2
+    assert values[6] == 1_500_000
+    assert values[7] == 120
+    assert values[8] == 1200
+    assert parsed["value"].isna().tolist() == [
+        False,
+        True,
+        False,
+        True,
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_parse_number_column_numeric_input():
+    parsed = parse_number_column(pd.Series([350000.0, None]))
+    assert parsed["status"].tolist() == ["numeric", "missing"]
+    assert parsed["value"].tolist()[0] == 350000.0
+
+
+def test_harmonize_listings_parses_raw_scraped_text():
+    scraped = pd.DataFrame(
+        {
+            "page_link": ["a", "b"],
+            "price": ["R$ 450.000", "Sob Consulta"],
+            "size_m2": ["120 m²", "80"],
+            "bedroom": ["3 Quartos", "2"],
+            "tipo": ["Comprar", "Alugar"],
+            "extra": [1, 2],
+        }
+    )
+    df = harmonize_listings(scraped, data_source="df-imoveis")
+
+    assert df["price"].tolist()[0] == 450_000
+    assert df["price_status"].tolist() == ["parsed", "on_request"]
+    assert df["size_m2"].tolist() == [120.0, 80.0]
+    assert df["bedrooms"].tolist() == [3.0, 2.0]
+    assert df["contract_type"].tolist() == ["venda", "aluguel"]
+    assert df["data_source"].tolist() == ["df-imoveis", "df-imoveis"]
+    assert "extra" not in df.columns
+
+
+@pytest.mark.parametrize("csv_engine", ["c", "pyarrow"])
+def test_read_data_file_keeps_thousands_separators(tmp_path, csv_engine):
+    # Every price has a dot, so type inference alone would read R$ 1.500 as 1.5
+    path = tmp_path / "imoveis_locacao.tsv"
+    rows = ["link\tpreco\tarea", "a\t1.500\t50", "b\t2.300\t1.200", "c\t950\t"]
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    table = read_data_file(str(path), "net-imoveis", csv_engine=csv_engine)
+    df = table.to_pandas()
+
+    assert df["price"].tolist() == [1500.0, 2300.0, 950.0]
+    assert df["price_status"].tolist() == ["parsed", "parsed", "parsed"]
+    assert df["size_m2"].tolist()[:2] == [50.0, 1200.0]
+    assert df["size_m2_status"].tolist()[2] == "missing"
+
+
+def test_streamed_chunks_keep_thousands_separators(tmp_path):
+    path = tmp_path / "imoveis_locacao.tsv"
+    path.write_text("link\tpreco\na\t1.500\nb\t2.300\n", encoding="utf-8")
+
+    chunks = list(iter_data_file_chunks(str(path), chunksize=1))
+    df = harmonize_listings(pd.concat(chunks), "net-imoveis")
+
+    assert df["price"].tolist() == [1500.0, 2300.0]
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from pipeline.data_scraping import ScraperOrchestrator
+
+
+@pytest.fixture
+def scripts_dir(tmp_path):
+    dataset = tmp_path / "scripts" / "net-imoveis" / "dataset"
+    dataset.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "link": ["a", "b", "c"],
+            "tipo": ["venda", "venda", "venda"],
+            "preco": ["R$ 500.000", "R$ 650.000", "-1"],
+            "area": ["100 m²", "120 m²", "90 m²"],
+        }
+    ).to_csv(dataset / "imoveis.tsv", sep="\t", index=False)
+    return tmp_path / "scripts"
+
+
+def _run(scripts_dir, output_dir, monkeypatch, **settings):
+    """Runs the incremental pipeline; also returns whether the parts were read."""
+    orchestrator = ScraperOrchestrator(base_scripts_dir=str(scripts_dir))
+    reads = []
+    read_merged_parts = orchestrator.read_merged_parts
+
+    def tracked_read(output_dir):
+        reads.append(output_dir)
+        return read_merged_parts(output_dir)
+
+    monkeypatch.setattr(orchestrator, "read_merged_parts", tracked_read)
+    results = orchestrator.run_pipeline(
+        str(output_dir), xlsx=False, incremental=True, **settings
+    )
+    return results, bool(reads)
+
+
+def test_incremental_run_without_changes_skips_reading_parts(
+    scripts_dir, tmp_path, monkeypatch
+):
+    output_dir = tmp_path / "output"
+    first, read = _run(scripts_dir, output_dir, monkeypatch)
+    assert read and first["merged_row_count"] == 3
+
+    second, read = _run(scripts_dir, output_dir, monkeypatch)
+    assert not read
+    assert second["merged_row_count"] == 3
+    assert second["output_files"] == first["output_files"]
+
+
+def test_incremental_run_reruns_when_settings_change(
+    scripts_dir, tmp_path, monkeypatch
+):
+    output_dir = tmp_path / "output"
+    _run(scripts_dir, output_dir, monkeypatch)
+
+    results, read = _run(scripts_dir, output_dir, monkeypatch, validate=True)
+    assert read
+    assert results["validation"]["quarantined"] == 1
+    assert results["merged_row_count"] == 2
+    assert (output_dir / "quarantined_properties.tsv").exists()
+
+    # The validation counts of the kept outputs are reported again
+    results, read = _run(scripts_dir, output_dir, monkeypatch, validate=True)
+    assert not read
+    assert results["validation"]["quarantined"] == 1
+
+
+def test_incremental_run_reloads_changed_inputs(scripts_dir, tmp_path, monkeypatch):
+    output_dir = tmp_path / "output"
+    _run(scripts_dir, output_dir, monkeypatch)
+
+    with open(scripts_dir / "net-imoveis" / "dataset" / "imoveis.tsv", "a") as f:
+        f.write("d\tvenda\tR$ 700.000\t150 m²\n")
+    results, read = _run(scripts_dir, output_dir, monkeypatch)
+
+    assert read
+    assert len(results["changes"]["reloaded"]) == 1
+    assert results["merged_row_count"] == 4
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from utils.data_handler import DataHandler
+from utils.schema import TEXT_DTYPE, apply_listing_schema
+
+
+def test_counts_become_nullable_int16():
+    df = apply_listing_schema(pd.DataFrame({"bedrooms": [3, None, None]}))
+    assert df["bedrooms"].dtype == "Int16"
+    assert df["bedrooms"].tolist()[0] == 3
+    assert df["bedrooms"].isna().tolist() == [False, True, True]
+
+
+def test_counts_out_of_int16_range_fall_back_to_float32():
+    df = apply_listing_schema(pd.DataFrame({"bedroom": [3, 40000]}))
+    assert df["bedroom"].dtype == "float32"
+    assert df["bedroom"].tolist() == [3.0, 40000.0]
+
+
+def test_fractional_counts_fall_back_to_float32():
+    df = apply_listing_schema(pd.DataFrame({"bathrooms": [1.5, 2.0]}))
+    assert df["bathrooms"].dtype == "float32"
+
+
+def test_unparsed_text_is_left_unchanged():
+    df = apply_listing_schema(pd.DataFrame({"price": ["R$ 1.200.000", "500000"]}))
+    assert df["price"].tolist() == ["R$ 1.200.000", "500000"]
+
+
+def test_scraped_text_is_not_reinterpreted():
+    # "1.500" is R$ 1.500, not 1.5: parsing is left to harmonization
+    data = [{"price": "1.500", "size": "1.200", "bedroom": "3"}]
+    df = DataHandler(data).create_dataframe("locacao")
+    assert df["price"].tolist() == ["1.500"]
+    assert df["size"].tolist() == ["1.200"]
+    assert df["bedroom"].tolist() == ["3"]
+
+
+def test_mixed_numbers_in_object_columns_are_cast():
+    df = apply_listing_schema(
+        pd.DataFrame({"price": pd.Series([1500, 2.5, None], dtype=object)})
+    )
+    assert df["price"].dtype == "float32"
+
+
+def test_text_and_categorical_columns():
+    df = apply_listing_schema(
+        pd.DataFrame({"contract_type": ["venda", "aluguel"], "page_link": ["a", "b"]})
+    )
+    assert df["contract_type"].dtype == "category"
+    assert df["page_link"].dtype == TEXT_DTYPE
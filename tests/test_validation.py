@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from pipeline.validation import (
+    positive_rule,
+    range_rule,
+    rule_masks,
+    validate_listings,
+)
+
+
+def _listings():
+    return pd.DataFrame(
+        {
+            "contract_type": ["venda", "aluguel", "venda", "venda", "aluguel"],
+            "price": [500000.0, 3000.0, -1.0, 500000.0, 3000.0],
+            "size_m2": [100.0, 80.0, 100.0, 5.0, np.nan],
+            "bedrooms": [3, 2, 2, np.nan, 30],
+            "latitude": [-15.8, -15.8, -15.8, -23.5, np.nan],
+            "longitude": [-47.9, -47.9, -47.9, -46.6, np.nan],
+            "title": ["Casa", "Apartamento", "Casa", "Kitnet", "{{ title }}"],
+        }
+    )
+
+
+def test_rule_masks_flag_each_violation():
+    masks = rule_masks(_listings())
+
+    assert masks["price_positive"].tolist() == [False, False, True, False, False]
+    assert masks["size_range"].tolist() == [False, False, False, True, False]
+    # Negative prices and 500000 / 5 m² are outside the sale range; no size passes
+    assert masks["price_m2_range"].tolist() == [False, False, True, True, False]
+    assert masks["bedrooms_vs_size"].tolist() == [False, False, False, False, True]
+    assert masks["coordinates_outside_df"].tolist() == [
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert masks["unrendered_template"].tolist() == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_validate_listings_quarantines_with_failed_rules():
+    valid, quarantined, counts = validate_listings(_listings())
+
+    assert valid.index.tolist() == [0, 1]
+    assert quarantined["failed_rules"].tolist() == [
+        "price_positive;price_m2_range",
+        "size_range;price_m2_range;coordinates_outside_df",
+        "bedrooms_vs_size;unrendered_template",
+    ]
+    assert counts["valid"] == 2
+    assert counts["quarantined"] == 3
+    assert counts["size_range"] == 1
+
+
+def test_custom_rules_and_missing_columns():
+    rules = [positive_rule("price_positive", "price"), range_rule("r", "x", 0, 1)]
+    df = pd.DataFrame({"price": [1.0, 0.0]})
+
+    valid, quarantined, counts = validate_listings(df, rules)
+
+    assert len(valid) == 1
+    assert counts == {"price_positive": 1, "r": 0, "valid": 1, "quarantined": 1}
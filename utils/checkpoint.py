@@ -0,0 +1,157 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def _fsync_file(path):
+    """Flushes a file's contents to disk."""
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Yields a temporary path next to `path`; once the block finishes it is flushed
+    and renamed over `path`, so readers only ever see the old or the new file.
+    The temporary file keeps the extension so pandas picks the right writer.
+    """
+    directory, filename = os.path.split(path)
+    root, ext = os.path.splitext(filename)
+    tmp_path = os.path.join(directory, f".{root}.{uuid.uuid4().hex}.tmp{ext}")
+    try:
+        yield tmp_path
+        _fsync_file(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BatchCheckpoint:
+    """
+    Records which batches were committed, and the size of the append-only files
+    they were written to, in a JSON manifest rewritten atomically after each batch.
+    A restarted crawl skips committed batches and truncates any partially written tail.
+
+    Batch IDs carry the ID of their crawl run (see start_run), so a crawl resumes
+    only the batches of its own unfinished run, never those of a previous day's
+    completed crawl.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.manifest = self._load()
+
+    def _load(self):
+        """Loads the manifest, returning an empty one if it does not exist yet."""
+        if not os.path.exists(self.manifest_path):
+            return {"batches": {}, "files": {}, "runs": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest.setdefault("runs", {})
+        return manifest
+
+    def _save(self):
+        """Persists the manifest through an atomic rename."""
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with atomic_write(self.manifest_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+
+    def start_run(self, prefix):
+        """
+        Returns the crawl run of `prefix`: the one left unfinished by an interrupted
+        crawl, whose committed batches are then resumed, or else a new run dated
+        now. The run has a run_id (e.g. 20250224T093000), to be put in the batch
+        IDs, and the crawl_date of its partitions.
+        """
+        run = self.manifest["runs"].get(prefix)
+        if run is None or run.get("finished_at"):
+            now = datetime.now()
+            run = {
+                "run_id": now.strftime("%Y%m%dT%H%M%S"),
+                "crawl_date": now.date().isoformat(),
+                "started_at": now.isoformat(),
+            }
+            self.manifest["runs"][prefix] = run
+            self._save()
+        return run
+
+    def finish_run(self, prefix):
+        """
+        Marks the current run of `prefix` finished and forgets its batches, so the
+        next crawl starts a new run instead of replaying this one.
+        """
+        # Batches may have been committed through other instances since this load
+        self.manifest = self._load()
+        run = self.manifest["runs"].get(prefix)
+        if run is None:
+            return
+        for batch_id in self.committed_batches(f"{prefix}{run['run_id']}-"):
+            del self.manifest["batches"][batch_id]
+        run["finished_at"] = datetime.now().isoformat()
+        self._save()
+
+    def is_committed(self, batch_id):
+        """Checks whether the batch was already committed."""
+        return batch_id in self.manifest["batches"]
+
+    def committed_batches(self, prefix=""):
+        """Returns the committed batch IDs starting with `prefix`."""
+        return [b for b in self.manifest["batches"] if b.startswith(prefix)]
+
+    def repair(self, filepath):
+        """
+        Truncates an append-only file back to its last committed size, discarding
+        rows left behind by a write that crashed before its batch was committed.
+        """
+        key = os.path.abspath(filepath)
+        current_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        committed_size = self.manifest["files"].get(key)
+        if committed_size is None:
+            # First batch for this file: whatever is there now is the baseline
+            self.manifest["files"][key] = current_size
+            self._save()
+            return
+        if current_size > committed_size:
+            print(f"Discarding uncommitted data at the end of {filepath}")
+            with open(filepath, "rb+") as f:
+                f.truncate(committed_size)
+
+    def commit(self, batch_id, rows=0, files=()):
+        """Marks the batch as committed, recording the current size of its files."""
+        for filepath in files:
+            _fsync_file(filepath)
+            self.manifest["files"][os.path.abspath(filepath)] = os.path.getsize(
+                filepath
+            )
+        self.manifest["batches"][batch_id] = {
+            "rows": rows,
+            "committed_at": datetime.now().isoformat(),
+        }
+        self._save()
+
+    def record_size(self, filepath):
+        """
+        Records the current size of a file rewritten outside of a batch (e.g.
+        deduplicated in place), so repair does not mistake it for a crashed write.
+        """
+        key = os.path.abspath(filepath)
+        if key in self.manifest["files"] and os.path.exists(filepath):
+            self.manifest["files"][key] = os.path.getsize(filepath)
+            self._save()
+
+    def reset(self, prefix="", files=()):
+        """Forgets committed batches and runs starting with `prefix` and the given files."""
+        for batch_id in self.committed_batches(prefix):
+            del self.manifest["batches"][batch_id]
+        for run_prefix in [p for p in self.manifest["runs"] if p.startswith(prefix)]:
+            del self.manifest["runs"][run_prefix]
+        for filepath in files:
+            self.manifest["files"].pop(os.path.abspath(filepath), None)
+        self._save()
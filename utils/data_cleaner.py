@@ -1,42 +1,214 @@
 import glob
+import math
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
 
-def clean_duplicates( input_dir, output_dir):
+from utils.checkpoint import BatchCheckpoint, atomic_write
+from utils.data_handler import CHECKPOINT_FILENAME
+
+# Chave de anúncio sem link: endereço, preço e área normalizados
+ADDRESS_KEY = ("address", "price", "size")
+
+DEFAULT_KEY = "page_link"
+DEFAULT_MEMORY_BUDGET_MB = 512
+DEFAULT_CHUNKSIZE = 100_000
+
+# Bytes de (hash, linha) por registro nos arquivos de partição
+_SPILL_ROW_BYTES = 16
+
+
+def _read_raw(path, **kwargs):
+    """Lê o TSV com todos os valores como texto, para regravá-los sem alteração."""
+    return pd.read_csv(
+        path, sep="\t", dtype=str, keep_default_na=False, na_filter=False, **kwargs
+    )
+
+
+def _key_columns(key, columns):
+    """Colunas da chave; sem chave explícita, page_link ou a primeira coluna."""
+    if key is None:
+        key = DEFAULT_KEY if DEFAULT_KEY in columns else columns[0]
+    key_columns = [key] if isinstance(key, str) else list(key)
+    missing = [col for col in key_columns if col not in columns]
+    if missing:
+        raise KeyError(f"Key columns not found: {missing}")
+    return key_columns
+
+
+def key_hashes(df, key_columns):
     """
-    Limpa duplicatas de todos os arquivos TSV no diretório especificado.
+    Hash de 64 bits da chave de cada linha. Os valores são normalizados antes
+    (minúsculas, sem espaços extras), de modo que "SQN 308 " e "sqn 308" coincidem.
     """
+    normalized = pd.DataFrame(
+        {
+            col: df[col]
+            .astype("string")
+            .str.strip()
+            .str.lower()
+            .str.replace(r"\s+", " ", regex=True)
+            for col in key_columns
+        }
+    )
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
 
-    tsv_files = glob.glob(os.path.join(input_dir, "*.tsv"))
 
-    if not tsv_files:
-        print(f"No TSV files found in {input_dir}")
-        return
+def _dedupe_in_memory(file_path, output_path, key):
+    df = _read_raw(file_path)
+    key_columns = _key_columns(key, list(df.columns))
+    duplicated = pd.Series(key_hashes(df, key_columns)).duplicated(keep="first")
 
-    print(f"Found {len(tsv_files)} TSV files to process")
+    with atomic_write(output_path) as tmp_path:
+        df[~duplicated.to_numpy()].to_csv(tmp_path, sep="\t", index=False)
+    return len(df), int(duplicated.sum())
 
-    for file_path in tsv_files:
-        file_name = os.path.basename(file_path)
-        print(f"\nProcessing {file_name}...")
 
+def _dedupe_external(file_path, output_path, key, memory_budget, chunksize):
+    """
+    Deduplicação externa em três passadas, com memória limitada ao orçamento:
+    1. lê o arquivo em blocos e distribui (hash da chave, número da linha) em
+       partições no disco, conforme o hash;
+    2. em cada partição, marca a primeira ocorrência de cada hash;
+    3. relê o arquivo em blocos gravando apenas as linhas marcadas.
+    A ordem original das linhas é mantida.
+    """
+    # As partições guardam 16 bytes por linha, bem menos que o próprio TSV
+    partitions = max(2, math.ceil(os.path.getsize(file_path) / memory_budget))
+
+    with tempfile.TemporaryDirectory(
+        dir=os.path.dirname(os.path.abspath(output_path))
+    ) as spill_dir:
+        spill_files = [
+            open(os.path.join(spill_dir, f"part-{i}.bin"), "wb")
+            for i in range(partitions)
+        ]
+        total_rows = 0
         try:
-            df = pd.read_csv(file_path, sep="\t")
+            for chunk in _read_raw(file_path, chunksize=chunksize):
+                key_columns = _key_columns(key, list(chunk.columns))
+                hashes = key_hashes(chunk, key_columns)
+                rows = np.arange(total_rows, total_rows + len(chunk), dtype=np.uint64)
+                total_rows += len(chunk)
 
-            initial_count = len(df)
-            print(f"Initial row count: {initial_count}")
+                targets = hashes % np.uint64(partitions)
+                for i in np.unique(targets):
+                    selected = targets == i
+                    np.column_stack((hashes[selected], rows[selected])).tofile(
+                        spill_files[i]
+                    )
+        finally:
+            for f in spill_files:
+                f.close()
 
-            df.drop_duplicates(subset=df.columns[0], keep="first", inplace=True)
+        keep = np.zeros(total_rows, dtype=bool)
+        for f in spill_files:
+            pairs = np.fromfile(f.name, dtype=np.uint64).reshape(-1, 2)
+            # Linhas em ordem crescente: a primeira de cada hash é a mais antiga
+            _, first = np.unique(pairs[:, 0], return_index=True)
+            keep[pairs[first, 1].astype(np.int64)] = True
+
+    start = 0
+    with atomic_write(output_path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            for i, chunk in enumerate(_read_raw(file_path, chunksize=chunksize)):
+                selected = keep[start : start + len(chunk)]
+                start += len(chunk)
+                chunk[selected].to_csv(out, sep="\t", index=False, header=i == 0)
+    return total_rows, int(total_rows - keep.sum())
+
+
+def dedupe_file(
+    file_path,
+    output_path,
+    key=None,
+    memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+    chunksize=DEFAULT_CHUNKSIZE,
+):
+    """
+    Remove linhas duplicadas de um TSV, mantendo a primeira ocorrência de cada
+    chave, e grava o resultado de forma atômica em output_path (que pode ser o
+    próprio arquivo). A chave é uma coluna ou uma lista de colunas (ex.:
+    ADDRESS_KEY); sem chave, usa page_link ou, na falta dela, a primeira coluna.
+    Arquivos maiores que o orçamento de memória são deduplicados externamente,
+    com partições por hash no disco.
+    """
+    memory_budget = memory_budget_mb * 1024 * 1024
+    file_name = os.path.basename(file_path)
+    try:
+        # O DataFrame em memória ocupa algumas vezes o tamanho do TSV
+        if os.path.getsize(file_path) * 4 <= memory_budget:
+            mode = "memory"
+            rows, removed = _dedupe_in_memory(file_path, output_path, key)
+        else:
+            mode = "external"
+            rows, removed = _dedupe_external(
+                file_path, output_path, key, memory_budget, chunksize
+            )
+    except Exception as e:
+        return {"file": file_name, "error": str(e)}
+    return {"file": file_name, "rows": rows, "removed": removed, "mode": mode}
+
+
+def clean_duplicates(
+    input_dir,
+    output_dir,
+    key=None,
+    workers=None,
+    memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+    chunksize=DEFAULT_CHUNKSIZE,
+):
+    """
+    Limpa duplicatas de todos os arquivos TSV no diretório especificado. Os
+    arquivos são processados em paralelo (workers processos, por padrão um por
+    CPU), cada um com seu orçamento de memória; veja dedupe_file. Retorna as
+    contagens de cada arquivo.
+    """
+
+    tsv_files = sorted(glob.glob(os.path.join(input_dir, "*.tsv")))
+
+    if not tsv_files:
+        print(f"No TSV files found in {input_dir}")
+        return []
+
+    print(f"Found {len(tsv_files)} TSV files to process")
+    os.makedirs(output_dir, exist_ok=True)
 
-            final_count = len(df)
-            print(f"Final row count: {final_count}")
-            print(f"Removed {initial_count - final_count} duplicate entries")
+    output_paths = [
+        os.path.join(output_dir, os.path.basename(path)) for path in tsv_files
+    ]
+    arguments = [
+        (path, output, key, memory_budget_mb, chunksize)
+        for path, output in zip(tsv_files, output_paths)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(tsv_files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(dedupe_file, *zip(*arguments)))
+    else:
+        results = [dedupe_file(*args) for args in arguments]
 
-            output_path = os.path.join(output_dir, file_name)
-            df.to_csv(output_path, sep="\t", index=False)
-            print(f"Cleaned file saved to {output_path}")
+    for result, output_path in zip(results, output_paths):
+        if "error" in result:
+            print(f"Error processing {result['file']}: {result['error']}")
+            continue
+        print(
+            f"{result['file']}: removed {result['removed']} of {result['rows']} rows "
+            f"({result['mode']}), saved to {output_path}"
+        )
 
-        except Exception as e:
-            print(f"Error processing {file_name}: {str(e)}")
+    # Arquivos regravados no lugar encolhem: o checkpoint dos lotes precisa do novo
+    # tamanho, senão BatchCheckpoint.repair cortaria o arquivo num ponto que já
+    # não é o fim de um lote
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    if os.path.exists(checkpoint_path):
+        checkpoint = BatchCheckpoint(checkpoint_path)
+        for result, output_path in zip(results, output_paths):
+            if "error" not in result:
+                checkpoint.record_size(output_path)
 
     print("\nLimpeza de duplicatas concluída!")
+    return results
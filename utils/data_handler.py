@@ -1,21 +1,73 @@
 import csv
 import os
+from datetime import datetime
 
 import pandas as pd
 
+from utils.checkpoint import BatchCheckpoint, atomic_write
+from utils.partitioned_dataset import PartitionedDataset
+from utils.schema import apply_listing_schema
+
+CHECKPOINT_FILENAME = "_checkpoint.json"
+
+# Values with leading/trailing whitespace, non-space whitespace or repeated spaces
+_DIRTY_WHITESPACE_RE = r"^\s|\s$|[^\S ]| {2}"
+
+
+def _collapse_whitespace(value):
+    """Collapses newlines, tabs and runs of whitespace into single spaces and strips."""
+    return " ".join(value.split()) if isinstance(value, str) else value
+
+
+def sanitize_text_column(series):
+    """
+    Cleans a text column in a single pass: every whitespace run (\r\n, \n, \r, \t, spaces)
+    becomes one space and the ends are stripped. Nulls and non-string values are preserved.
+    """
+    if isinstance(series.dtype, pd.StringDtype):
+        # Only the values flagged by the string kernel need to be rebuilt in Python
+        dirty = series.str.contains(_DIRTY_WHITESPACE_RE, regex=True).fillna(False)
+        if not dirty.any():
+            return series
+        cleaned = series.copy()
+        cleaned[dirty] = [_collapse_whitespace(v) for v in series[dirty].to_numpy()]
+        return cleaned
+    cleaned = [_collapse_whitespace(value) for value in series.to_numpy()]
+    return pd.Series(cleaned, index=series.index, name=series.name, dtype=object)
+
+
+def sanitize_text_columns(df):
+    """
+    Returns a shallow copy of the DataFrame with its text columns sanitized.
+    Numeric columns are shared with the original frame, not copied.
+    """
+    sanitized = df.copy(deep=False)
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype == object or isinstance(dtype, pd.StringDtype):
+            sanitized[col] = sanitize_text_column(df[col])
+    return sanitized
+
 
 class DataHandler:
     def __init__(self, data):
         self.data = data
 
-    def create_dataframe(self, contract_type):
-        """Creates a Pandas DataFrame from the property data and adds a 'contract_type' column."""
+    def create_dataframe(self, contract_type, typed=True):
+        """
+        Creates a Pandas DataFrame from the property data and adds a 'contract_type' column.
+        With `typed`, the listing schema is applied (categoricals, float32/Int16, Arrow strings).
+        """
         df = pd.DataFrame(self.data)
         df["contract_type"] = contract_type
-        return df
+        return apply_listing_schema(df) if typed else df
 
     def save_to_excel(self, df, filename, output_dir=None, append=False):
-        """Saves the DataFrame to an Excel file."""
+        """
+        Saves the DataFrame to an Excel file.
+        Appending re-reads and rewrites the whole workbook, so batch loops should use
+        save_batch and export_partitions_to_excel once at the end instead.
+        """
         # Create full path
         filepath = os.path.join(output_dir, filename) if output_dir else filename
 
@@ -26,19 +78,120 @@ class DataHandler:
         # If append and file exists, append to it
         if append and os.path.exists(filepath):
             try:
-                # This is a more reliable way to append to Excel
                 existing_df = pd.read_excel(filepath)
-                combined_df = pd.concat([existing_df, df], ignore_index=True)
-                combined_df.to_excel(filepath, index=False)
             except Exception as e:
+                # Never overwrite an unreadable workbook with just this batch:
+                # keep it untouched and save the batch next to it
+                root, ext = os.path.splitext(filepath)
+                recovery_path = f"{root}.recovered-{datetime.now():%Y%m%d_%H%M%S}{ext}"
                 print(f"Error when appending to Excel file: {e}")
-                # Fallback: just save the current data
-                df.to_excel(filepath, index=False)
-        else:
-            # Create a new file or overwrite existing
-            df.to_excel(filepath, index=False)
+                print(f"Existing file kept; batch saved to {recovery_path}")
+                with atomic_write(recovery_path) as tmp_path:
+                    df.to_excel(tmp_path, index=False)
+                return recovery_path
+            df = pd.concat([existing_df, df], ignore_index=True)
+
+        # Write through a temporary file so a crash never leaves a corrupt workbook
+        with atomic_write(filepath) as tmp_path:
+            df.to_excel(tmp_path, index=False)
 
         print(f"Excel data saved to {filepath}")
+        return filepath
+
+    def save_to_partition(self, df, dataset_dir, partition, batch_id=None):
+        """
+        Appends the DataFrame as a Parquet segment of a partition of the dataset at
+        `dataset_dir`; `partition` maps source, contract_type, property_type and
+        optionally crawl_date. A `batch_id` that was already committed is skipped.
+        """
+        entry = PartitionedDataset(dataset_dir).write(
+            df, batch_id=batch_id, **partition
+        )
+        print(
+            f"Batch with {len(df)} rows saved to {dataset_dir}/{entry['path']} "
+            f"({entry['rows']} rows in partition)"
+        )
+        return entry
+
+    def export_partitions_to_excel(
+        self, dataset_dir, filename, output_dir=None, **filters
+    ):
+        """Generates a single Excel file from the partitions matching the filters."""
+        filepath = os.path.join(output_dir, filename) if output_dir else filename
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        df = PartitionedDataset(dataset_dir).read(**filters)
+        with atomic_write(filepath) as tmp_path:
+            df.to_excel(tmp_path, index=False)
+        print(f"Excel export with {len(df)} rows saved to {filepath}")
+        return filepath
+
+    def drop_partitions(self, dataset_dir, **filters):
+        """Removes the partitions matching the filters, used when not appending."""
+        dropped = PartitionedDataset(dataset_dir).drop(**filters)
+        print(f"Removed {dropped} partitions from {dataset_dir}")
+        return dropped
+
+    def get_checkpoint(self, output_dir=None):
+        """Returns the batch checkpoint manifest kept in the output directory."""
+        return BatchCheckpoint(os.path.join(output_dir or "", CHECKPOINT_FILENAME))
+
+    def save_batch(
+        self,
+        df,
+        batch_id,
+        dataset_dir,
+        partition,
+        text_filename,
+        output_dir=None,
+        separator="\t",
+        encoding="utf-8",
+        sink=None,
+    ):
+        """
+        Crash-safe, idempotent batch save: the batch becomes a Parquet segment of its
+        dataset partition and is appended to the delimited text file, then its ID is
+        committed to the checkpoint manifest. Committed batches are skipped and
+        uncommitted tails are truncated. Returns False when the batch was already committed.
+
+        With a `sink` (e.g. Property.write_behind()) the committed rows are also queued
+        for the database, tagged with the partition's source, contract and property type.
+        """
+        text_path = (
+            os.path.join(output_dir, text_filename) if output_dir else text_filename
+        )
+        checkpoint = self.get_checkpoint(os.path.dirname(text_path))
+        if checkpoint.is_committed(batch_id):
+            print(f"Batch {batch_id} already committed, skipping")
+            return False
+
+        checkpoint.repair(text_path)
+
+        self.save_to_partition(df, dataset_dir, partition, batch_id=batch_id)
+        saved_path = self.save_to_csv(
+            df,
+            text_filename,
+            output_dir,
+            append=True,
+            separator=separator,
+            encoding=encoding,
+        )
+        if saved_path is None:
+            raise IOError(f"Batch {batch_id} could not be written to {text_path}")
+
+        checkpoint.commit(batch_id, rows=len(df), files=[saved_path])
+
+        if sink is not None:
+            tags = {
+                "data_source": partition.get("source"),
+                "contract_type": partition.get("contract_type"),
+                "property_type": partition.get("property_type"),
+            }
+            sink.put_frame(
+                df.assign(**{k: v for k, v in tags.items() if k not in df.columns})
+            )
+        return True
 
     def save_to_csv(
         self,
@@ -48,8 +201,13 @@ class DataHandler:
         append=False,
         separator=",",
         encoding="utf-8",
+        chunksize=100_000,
     ):
-        """Saves the DataFrame to a delimited text file (CSV by default, TSV if separator='\t')."""
+        """
+        Saves the DataFrame to a delimited text file (CSV by default, TSV if separator='\t').
+        Text fields are sanitized and written in chunks of `chunksize` rows; nulls are kept
+        as empty fields instead of the literal "nan".
+        """
 
         # Create full path
         filepath = os.path.join(output_dir, filename) if output_dir else filename
@@ -63,45 +221,35 @@ class DataHandler:
         mode = "a" if append and file_exists else "w"
         header = not (append and file_exists)
 
-        # Make a copy to avoid modifying the original DataFrame
-        df_to_save = df.copy()
-
-        # Clean text fields: remove newlines, tabs that are not separators, etc.
-        for col in df_to_save.select_dtypes(include="object").columns:
-            # Ensure column is string type and fill NaNs with empty string
-            s_series = df_to_save[col].astype(str).fillna("")
-
-            # Replace carriage returns and newlines with a space
-            s_series = s_series.str.replace("\r\n", " ", regex=False)
-            s_series = s_series.str.replace("\n", " ", regex=False)
-            s_series = s_series.str.replace("\r", " ", regex=False)
-
-            # If the separator is a tab, replace literal tab characters within fields with spaces.
-            if separator == "\t":
-                s_series = s_series.str.replace("\t", " ", regex=False)
-
-            # Consolidate multiple whitespace characters into a single space
-            s_series = s_series.str.replace(r"\s+", " ", regex=True)
-
-            # Strip leading/trailing whitespace
-            df_to_save[col] = s_series.str.strip()
-
         try:
-            df_to_save.to_csv(
-                filepath,
-                sep=separator,
-                index=False,
-                encoding=encoding,
-                mode=mode,
-                header=header,
-                quoting=csv.QUOTE_MINIMAL,  # Escapa só se necessário
-            )
+            # Sanitize and write chunk by chunk so large appends never hold a
+            # second full copy of the text columns in memory
+            for start in range(0, max(len(df), 1), chunksize):
+                chunk = sanitize_text_columns(df.iloc[start : start + chunksize])
+                chunk.to_csv(
+                    filepath,
+                    sep=separator,
+                    index=False,
+                    encoding=encoding,
+                    mode=mode,
+                    header=header,
+                    quoting=csv.QUOTE_MINIMAL,  # Escapa só se necessário
+                )
+                mode, header = "a", False
             print(f"Data saved to {filepath}")
+            return filepath
         except Exception as e:
             print(f"Error saving file {filepath}: {e}")
+            return None
 
     def save_to_tsv(
-        self, df, filename, output_dir=None, append=False, encoding="utf-8"
+        self,
+        df,
+        filename,
+        output_dir=None,
+        append=False,
+        encoding="utf-8",
+        chunksize=100_000,
     ):
         """Saves the DataFrame to a TSV file (tab-separated values)."""
         # Make sure filename has .tsv extension
@@ -112,6 +260,12 @@ class DataHandler:
                 filename = filename + ".tsv"
 
         # Call save_to_csv with tab separator
-        self.save_to_csv(
-            df, filename, output_dir, append, separator="\t", encoding=encoding
+        return self.save_to_csv(
+            df,
+            filename,
+            output_dir,
+            append,
+            separator="\t",
+            encoding=encoding,
+            chunksize=chunksize,
         )
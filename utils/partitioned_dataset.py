@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils.checkpoint import atomic_write
+from utils.segment_store import SegmentStore
+
+PARTITION_KEYS = ("source", "contract_type", "property_type", "crawl_date")
+PARTITIONS_MANIFEST = "_partitions.json"
+DEFAULT_PARTITION_VALUE = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partition_value(value):
+    """Formats a partition value for a directory name (key=value)."""
+    if value is None or value == "":
+        return DEFAULT_PARTITION_VALUE
+    if isinstance(value, (date, datetime)):
+        value = value.strftime("%Y-%m-%d")
+    return str(value).strip().lower().replace("/", "-").replace("=", "-")
+
+
+def _crawl_group(entry):
+    """Partition keys other than crawl_date: what one crawl of a scraper covers."""
+    return tuple(entry[key] for key in PARTITION_KEYS if key != "crawl_date")
+
+
+class PartitionedDataset:
+    """
+    Hive-style partitioned listing dataset:
+
+        root/source=df-imoveis/contract_type=venda/property_type=casa/crawl_date=2025-02-24/
+
+    Each partition is a SegmentStore. A root manifest records, per partition, the
+    row count, schema and a content hash, so readers can find and prune partitions
+    (e.g. only `aluguel` from the last crawl) without listing or opening files.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest_path = os.path.join(root, PARTITIONS_MANIFEST)
+
+    def _load_manifest(self):
+        """Loads the root manifest, returning an empty one for a new dataset."""
+        if not os.path.exists(self.manifest_path):
+            return {"partitions": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """Rewrites the root manifest atomically."""
+        os.makedirs(self.root, exist_ok=True)
+        with atomic_write(self.manifest_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def partition_dir(**values):
+        """Relative directory of a partition, in PARTITION_KEYS order."""
+        return os.path.join(
+            *[f"{key}={_partition_value(values.get(key))}" for key in PARTITION_KEYS]
+        )
+
+    def _describe(self, relative_dir, values):
+        """Builds the manifest entry of a partition from its segment manifest."""
+        segments = SegmentStore(os.path.join(self.root, relative_dir)).segments()
+
+        schema = {}
+        for segment in segments:
+            schema.update(segment.get("schema", {}))
+
+        content_hash = hashlib.sha256()
+        for segment in segments:
+            content_hash.update(segment.get("sha256", "").encode())
+
+        entry = {key: _partition_value(values.get(key)) for key in PARTITION_KEYS}
+        entry.update(
+            {
+                "path": relative_dir,
+                "rows": sum(segment["rows"] for segment in segments),
+                "segments": len(segments),
+                "schema": schema,
+                "content_hash": content_hash.hexdigest(),
+                "updated_at": datetime.now().isoformat(),
+            }
+        )
+        return entry
+
+    def write(
+        self, df, source, contract_type, property_type, crawl_date=None, batch_id=None
+    ):
+        """
+        Appends the DataFrame as a segment of its partition and refreshes the
+        partition's manifest entry. `crawl_date` defaults to today.
+        """
+        values = {
+            "source": source,
+            "contract_type": contract_type,
+            "property_type": property_type,
+            "crawl_date": crawl_date or date.today(),
+        }
+        relative_dir = self.partition_dir(**values)
+        SegmentStore(os.path.join(self.root, relative_dir)).append(
+            df, batch_id=batch_id
+        )
+
+        manifest = self._load_manifest()
+        manifest["partitions"][relative_dir] = self._describe(relative_dir, values)
+        self._write_manifest(manifest)
+        return manifest["partitions"][relative_dir]
+
+    def partitions(self, **filters):
+        """
+        Returns the manifest entries matching the filters. Each filter is a value or
+        a list of accepted values; `crawl_date="latest"` keeps only the most recent
+        crawl of each source, contract type and property type among the remaining
+        partitions (property types are crawled one after the other, so their last
+        crawls can fall on different days).
+        """
+        latest = filters.get("crawl_date") == "latest"
+        if latest:
+            filters = {k: v for k, v in filters.items() if k != "crawl_date"}
+
+        entries = []
+        for entry in self._load_manifest()["partitions"].values():
+            matches = True
+            for key, accepted in filters.items():
+                if accepted is None:
+                    continue
+                if not isinstance(accepted, (list, tuple, set)):
+                    accepted = [accepted]
+                if entry[key] not in {_partition_value(v) for v in accepted}:
+                    matches = False
+                    break
+            if matches:
+                entries.append(entry)
+
+        if latest:
+            last_crawl = {}
+            for entry in entries:
+                group = _crawl_group(entry)
+                last_crawl[group] = max(last_crawl.get(group, ""), entry["crawl_date"])
+            entries = [
+                e for e in entries if e["crawl_date"] == last_crawl[_crawl_group(e)]
+            ]
+
+        return sorted(entries, key=lambda entry: entry["path"])
+
+    def read(self, **filters):
+        """
+        Reads the matching partitions into one DataFrame, adding the partition keys
+        as columns when the data does not already carry them.
+        """
+        frames = []
+        for entry in self.partitions(**filters):
+            df = SegmentStore(os.path.join(self.root, entry["path"])).read()
+            for key in PARTITION_KEYS:
+                if key not in df.columns:
+                    df[key] = entry[key]
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def read_batch(self, batch_id, **filters):
+        """Reads the segment committed for `batch_id` in any matching partition."""
+        for entry in self.partitions(**filters):
+            store = SegmentStore(os.path.join(self.root, entry["path"]))
+            if store.has_batch(batch_id):
+                return store.read_batch(batch_id)
+        return None
+
+    def drop(self, **filters):
+        """Deletes the matching partitions and removes them from the manifest."""
+        manifest = self._load_manifest()
+        dropped = self.partitions(**filters)
+        for entry in dropped:
+            shutil.rmtree(os.path.join(self.root, entry["path"]), ignore_errors=True)
+            manifest["partitions"].pop(entry["path"], None)
+        if dropped:
+            self._write_manifest(manifest)
+        return len(dropped)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# Arrow-backed strings keep long free text (addresses, descriptions) in one buffer
+# instead of one Python object per cell
+TEXT_DTYPE = "string[pyarrow]"
+
+# Explicit dtypes of the listing columns emitted by the scrapers. Low-cardinality
+# fields become categoricals; measures use float32 (exact for whole prices up to
+# ~16.7 million) and counts nullable Int16. Coordinates stay float64 for precision.
+LISTING_SCHEMA = {
+    "data_source": "category",
+    "contract_type": "category",
+    "property_type": "category",
+    "type": "category",
+    "region": "category",
+    "price": "float32",
+    "size_m2": "float32",
+    "size": "float32",
+    "bedroom": "Int16",
+    "bedrooms": "Int16",
+    "bathrooms": "Int16",
+    "parking_spaces": "Int16",
+    "car_spaces": "Int16",
+    "latitude": "float64",
+    "longitude": "float64",
+    "page_link": TEXT_DTYPE,
+    "address": TEXT_DTYPE,
+    "full_address": TEXT_DTYPE,
+    "description": TEXT_DTYPE,
+    "title": TEXT_DTYPE,
+    "amenities": TEXT_DTYPE,
+    "condo_fee_iptu": TEXT_DTYPE,
+}
+
+
+# Inferred types (pandas.api.types.infer_dtype) of columns holding only numbers
+_NUMERIC_INFERRED = ("integer", "floating", "mixed-integer-float", "decimal", "empty")
+
+
+def _to_numeric(series, dtype):
+    """
+    Casts a column that already holds numbers to a numeric dtype. Text is never
+    reinterpreted: scraped values such as "1.500" (R$ 1.500 in Brazilian notation)
+    or "R$ 1.200.000" are left for pipeline.data_harmonization to parse, so the
+    column is returned as None and kept unchanged.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return None
+    if not pd.api.types.is_numeric_dtype(series):
+        if pd.api.types.infer_dtype(series, skipna=True) not in _NUMERIC_INFERRED:
+            return None
+    numeric = pd.to_numeric(series)
+    if dtype.startswith("Int"):
+        # Nullable integers only hold whole values within their range; anything
+        # else (2.5 bathrooms, 40000 bedrooms) is kept as float32 for validation
+        # to judge, instead of failing the cast and the whole batch with it
+        bounds = np.iinfo(dtype.lower())
+        fractional = ((numeric % 1).fillna(0) != 0).any()
+        out_of_range = not numeric.dropna().between(bounds.min, bounds.max).all()
+        if fractional or out_of_range:
+            return numeric.astype("float32")
+        return numeric.round().astype(dtype)
+    return numeric.astype(dtype)
+
+
+def apply_listing_schema(df, schema=None):
+    """
+    Returns the DataFrame with the listing schema applied to the columns it has.
+    Columns outside the schema, or whose values do not fit it (e.g. numbers still
+    scraped as text), are left as they are.
+    """
+    schema = LISTING_SCHEMA if schema is None else schema
+
+    typed = df.copy(deep=False)
+    for col, dtype in schema.items():
+        if col not in typed.columns or typed[col].dtype == dtype:
+            continue
+        if dtype in ("category", TEXT_DTYPE):
+            typed[col] = typed[col].astype(dtype)
+        else:
+            converted = _to_numeric(typed[col], dtype)
+            if converted is not None:
+                typed[col] = converted
+    return typed
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.checkpoint import atomic_write
+
+MANIFEST_FILENAME = "_manifest.json"
+
+
+def _file_sha256(path):
+    """SHA-256 of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SegmentStore:
+    """
+    Append-only columnar store: every batch is written as an immutable Parquet
+    segment and registered in a small JSON manifest. Appending a batch costs the
+    same regardless of how many rows were already saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest_path = os.path.join(path, MANIFEST_FILENAME)
+
+    def _load_manifest(self):
+        """Loads the manifest, returning an empty one if the store is new."""
+        if not os.path.exists(self.manifest_path):
+            return {"segments": []}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """Rewrites the manifest through a temporary file and an atomic rename."""
+        with atomic_write(self.manifest_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def _to_arrow_table(df):
+        """Converts the DataFrame to Arrow, stringifying object columns with mixed types."""
+        columns = {}
+        for col in df.columns:
+            series = df[col]
+            try:
+                columns[str(col)] = pa.array(series, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # e.g. price holding both floats and "" for "Sob Consulta"
+                as_text = series.map(lambda v: None if pd.isna(v) else str(v))
+                columns[str(col)] = pa.array(
+                    as_text, type=pa.string(), from_pandas=True
+                )
+        return pa.table(columns)
+
+    def segments(self):
+        """Returns the manifest entries of all committed segments."""
+        return self._load_manifest()["segments"]
+
+    def row_count(self):
+        """Total number of rows across all segments, read from the manifest."""
+        return sum(segment["rows"] for segment in self.segments())
+
+    def has_batch(self, batch_id):
+        """Checks whether a segment was already committed for the batch."""
+        return any(segment.get("batch_id") == batch_id for segment in self.segments())
+
+    def append(self, df, batch_id=None):
+        """
+        Writes the DataFrame as a new segment and registers it in the manifest.
+        When `batch_id` was already committed the batch is skipped, so re-running
+        a crawl never appends the same batch twice.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._load_manifest()
+
+        if batch_id is not None:
+            for segment in manifest["segments"]:
+                if segment.get("batch_id") == batch_id:
+                    return segment
+
+        table = self._to_arrow_table(df)
+        segment_name = f"segment-{len(manifest['segments']) + 1:06d}.parquet"
+        with atomic_write(os.path.join(self.path, segment_name)) as tmp_path:
+            pq.write_table(table, tmp_path)
+            content_hash = _file_sha256(tmp_path)
+
+        entry = {
+            "file": segment_name,
+            "batch_id": batch_id,
+            "rows": len(df),
+            "schema": {field.name: str(field.type) for field in table.schema},
+            "sha256": content_hash,
+            "created_at": datetime.now().isoformat(),
+        }
+        manifest["segments"].append(entry)
+        self._write_manifest(manifest)
+        return entry
+
+    def read_batch(self, batch_id):
+        """Reads the segment committed for `batch_id`, or None if there is none."""
+        for segment in self.segments():
+            if segment.get("batch_id") == batch_id:
+                return pd.read_parquet(os.path.join(self.path, segment["file"]))
+        return None
+
+    def read(self):
+        """Reads all segments back into a single DataFrame, in append order."""
+        frames = [
+            pd.read_parquet(os.path.join(self.path, segment["file"]))
+            for segment in self.segments()
+        ]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def export_excel(self, filepath):
+        """Generates an Excel file from all segments in a single write."""
+        df = self.read()
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with atomic_write(filepath) as tmp_path:
+            df.to_excel(tmp_path, index=False)
+        return len(df)
+
+    def clear(self):
+        """Removes every segment and resets the manifest."""
+        for segment in self.segments():
+            segment_path = os.path.join(self.path, segment["file"])
+            if os.path.exists(segment_path):
+                os.remove(segment_path)
+        if os.path.exists(self.path):
+            self._write_manifest({"segments": []})